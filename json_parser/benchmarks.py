@@ -0,0 +1,287 @@
+import json
+import multiprocessing
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+from json_parser.services.json_parser import parse
+from json_parser.services.fast_parser import parse_fast
+from json_parser.services.batch import parse_batch
+from json_parser.services.validate import validate
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Run with: python -m json_parser.benchmarks
+# The full suite, with JSON output: python manage.py bench_parser
+
+JSON_ORG_TESTS = Path(__file__).resolve().parent / 'tests' / 'json.org_tests' / 'test'
+DEFAULT_SIZE = 1_000_000 # characters per generated corpus
+NESTING_DEPTH = 18 # inside the top-level array, so parse() stays within its default depth limit
+
+PARSERS: Dict[str, Callable[[str], Any]] = {
+    'parse': parse,
+    'parse_fast': parse_fast,
+    'validate': validate,
+    'json.loads': json.loads,
+}
+
+WORDS = ['alpha', 'beta', 'gamma', 'delta', 'status', 'value', 'user', 'order', 'item', 'price']
+UNICODE_WORDS = ['café', 'naïve', 'Ωμέγα', 'привет', 'こんにちは', '数据', '한국어', 'مرحبا', '🙂', '🚀✨']
+# no surrogate pairs: parse() keeps them as two code points where json.loads joins them
+ESCAPES = ['\\n', '\\t', '\\"', '\\\\', '\\/', '\\u00e9', '\\u4e2d', '\\u20ac']
+
+
+def record(i: int) -> str:
+    return f'{{"id": {i}, "name": "user{i}", "email": "user{i}@example.com", "active": true, "score": {i * 0.5}}}'
+
+
+def records_document(count: int = 20000) -> str:
+    # An array of records that all share the same keys, like a typical API response
+    return '[' + ', '.join(record(i) for i in range(count)) + ']'
+
+
+def flat_object_document(count: int = 100000) -> str:
+    # The shape of JsonParserTestCase.test_large_flat_object: one object whose keys are all distinct
+    return '{' + ', '.join(f'"key{i}": {i}' for i in range(count)) + '}'
+
+
+def fill(make_item: Callable[[int], str], size: int, brackets: str = '[]') -> str:
+    # A container of make_item(0), make_item(1), ... about size characters long
+    items, length = [], 2
+    while length < size:
+        item = make_item(len(items))
+        items.append(item)
+        length += len(item) + 2
+    return brackets[0] + ', '.join(items) + brackets[1]
+
+
+def nested(i: int, depth: int) -> str:
+    # Objects and arrays alternating down to a number
+    if depth == 0:
+        return str(i)
+    if depth % 2:
+        return f'[{nested(i, depth - 1)}, {i}]'
+    return f'{{"level{depth}": {nested(i, depth - 1)}, "id": {i}}}'
+
+
+def flat_array(size: int) -> List[str]:
+    generator = random.Random(0)
+    scalars = [
+        lambda i: str(generator.randint(-10 ** 6, 10 ** 6)),
+        lambda i: f'{generator.uniform(-1e3, 1e3):.4f}',
+        lambda i: f'"{generator.choice(WORDS)}{i}"',
+        lambda i: generator.choice(['true', 'false', 'null']),
+    ]
+    return [fill(lambda i: generator.choice(scalars)(i), size)]
+
+
+def wide_object(size: int) -> List[str]:
+    generator = random.Random(0)
+    return [fill(lambda i: f'"{generator.choice(WORDS)}_{i}": {generator.randint(0, 10 ** 6)}', size, '{}')]
+
+
+def deep_nesting(size: int) -> List[str]:
+    return [fill(lambda i: nested(i, NESTING_DEPTH), size)]
+
+
+def string_heavy(size: int) -> List[str]:
+    generator = random.Random(0)
+    return [fill(lambda i: '"' + ' '.join(generator.choices(WORDS, k=generator.randint(4, 40))) + '"', size)]
+
+
+def escape_heavy(size: int) -> List[str]:
+    generator = random.Random(0)
+    return [fill(lambda i: '"' + 'ab'.join(generator.choices(ESCAPES, k=generator.randint(4, 20))) + '"', size)]
+
+
+def unicode_heavy(size: int) -> List[str]:
+    generator = random.Random(0)
+    return [fill(lambda i: '"' + ' '.join(generator.choices(UNICODE_WORDS, k=generator.randint(4, 20))) + '"', size)]
+
+
+def numeric_heavy(size: int) -> List[str]:
+    generator = random.Random(0)
+    numbers = [
+        lambda: str(generator.randint(0, 999)),
+        lambda: str(generator.randint(-10 ** 15, 10 ** 15)),
+        lambda: repr(generator.uniform(-1e6, 1e6)),
+        lambda: f'{generator.uniform(1, 10):.3f}e{generator.randint(-30, 30)}',
+    ]
+    return [fill(lambda i: generator.choice(numbers)(), size)]
+
+
+def records(size: int) -> List[str]:
+    return [fill(record, size)]
+
+
+def small_documents(size: int) -> List[str]:
+    # Many short documents, as in a batch of API payloads; docs/s matters more than MB/s here
+    documents, length = [], 0
+    while length < size:
+        document = f'{{"id": {len(documents)}, "tags": ["a", "b"], "ok": true}}'
+        documents.append(document)
+        length += len(document)
+    return documents
+
+
+def json_org(size: int) -> List[str]:
+    # The valid files of the json.org suite, as shipped; size is ignored
+    return [path.read_text() for path in sorted(JSON_ORG_TESTS.glob('pass*.json'))]
+
+
+CORPORA: Dict[str, Callable[[int], List[str]]] = {
+    'flat_array': flat_array,
+    'wide_object': wide_object,
+    'deep_nesting': deep_nesting,
+    'string_heavy': string_heavy,
+    'escape_heavy': escape_heavy,
+    'unicode_heavy': unicode_heavy,
+    'numeric_heavy': numeric_heavy,
+    'records': records,
+    'small_documents': small_documents,
+    'json_org': json_org,
+}
+
+
+def best_time(function, repeat: int = 5) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def retained_memory(function) -> int:
+    # Bytes still allocated by the parsed result once parsing is over
+    tracemalloc.start()
+    result = function()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def parse_all(parser: str, documents: List[str]) -> List[Any]:
+    function = PARSERS[parser]
+    return [function(document) for document in documents]
+
+
+def allocated_blocks(parser: str, documents: List[str]) -> int:
+    # Memory blocks still allocated by the parsed results, roughly the objects they are made of
+    before = sys.getallocatedblocks()
+    result = parse_all(parser, documents)
+    blocks = sys.getallocatedblocks() - before
+    del result
+    return blocks
+
+
+def peak_allocated(parser: str, documents: List[str]) -> int:
+    # Most bytes allocated at once while parsing, intermediate objects included
+    tracemalloc.start()
+    try:
+        parse_all(parser, documents)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def rss_growth(parser: str, documents: List[str]) -> int:
+    # Runs in a fresh process: how far parsing raises its peak resident set, in bytes
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    parse_all(parser, documents)
+    growth = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before
+    return growth if sys.platform == 'darwin' else growth * 1024 # Linux reports KiB
+
+
+def peak_rss(parser: str, documents: List[str]) -> int | None:
+    # None where processes can't be forked, since the peak of this process only ever grows
+    if resource is None or 'fork' not in multiprocessing.get_all_start_methods():
+        return None
+    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context('fork')) as executor:
+        return executor.submit(rss_growth, parser, documents).result()
+
+
+def measure(parser: str, documents: List[str], repeat: int = 5, rss: bool = True) -> Dict[str, Any]:
+    size = sum(len(document.encode()) for document in documents)
+    seconds = best_time(lambda: parse_all(parser, documents), repeat)
+    return {
+        'bytes': size,
+        'documents': len(documents),
+        'seconds': seconds,
+        'mb_per_s': size / seconds / 1e6,
+        'docs_per_s': len(documents) / seconds,
+        'peak_rss_bytes': peak_rss(parser, documents) if rss else None,
+        'peak_allocated_bytes': peak_allocated(parser, documents),
+        'allocated_blocks': allocated_blocks(parser, documents),
+    }
+
+
+def run_suite(corpora: List[str] | None = None, parsers: List[str] | None = None, size: int = DEFAULT_SIZE,
+              repeat: int = 5, rss: bool = True) -> Dict[str, Any]:
+    # Every parser on every corpus. Corpora are generated from a fixed seed, so the
+    # results of two runs (e.g. on two commits) can be compared case by case.
+    results = []
+    for corpus in corpora or CORPORA:
+        documents = CORPORA[corpus](size)
+        for parser in parsers or PARSERS:
+            results.append({'corpus': corpus, 'parser': parser, **measure(parser, documents, repeat, rss)})
+    return {
+        'python': platform.python_implementation() + ' ' + platform.python_version(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'size': size,
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def bench_key_cache(json_string: str, label: str = "repeated-key records"):
+    print(f"Key cache, {len(json_string) / 1e6:.1f} MB of {label}")
+    for label, size in (("off", 0), ("on", 4096)):
+        seconds = best_time(lambda: parse(json_string, key_cache_size=size))
+        memory = retained_memory(lambda: parse(json_string, key_cache_size=size))
+        print(f"  {label:<4} {seconds * 1000:8.1f} ms  {memory / 1e6:8.2f} MB retained")
+
+
+def bench_batch(count: int = 20000):
+    documents = [f'{{"id": {i}, "name": "user{i}", "tags": ["a", "b"], "score": {i * 0.5}}}' for i in range(count)]
+    size = sum(map(len, documents))
+    print(f"parse_batch, {count} documents, {size / 1e6:.1f} MB")
+    for workers in sorted({1, 2, os.cpu_count() or 1}):
+        seconds = best_time(lambda: parse_batch(documents, workers=workers), repeat=3)
+        print(f"  {workers:>2} workers {seconds * 1000:8.1f} ms  {size / seconds / 1e6:6.2f} MB/s")
+
+
+def bench_numbers(count: int = 200000):
+    generator = random.Random(0)
+    documents = {
+        "small ints": '[' + ', '.join(str(generator.randint(0, 500)) for _ in range(count)) + ']',
+        "large ints": '[' + ', '.join(str(generator.randint(0, 10 ** 12)) for _ in range(count)) + ']',
+        "floats": '[' + ', '.join(f'{generator.uniform(-1e3, 1e3):.6f}' for _ in range(count)) + ']',
+    }
+    print(f"Numbers, {count} per document")
+    for label, json_string in documents.items():
+        slow = best_time(lambda: parse(json_string), repeat=3)
+        fast = best_time(lambda: parse_fast(json_string), repeat=3)
+        print(f"  {label:<11} parse {slow * 1000:8.1f} ms  parse_fast {fast * 1000:8.1f} ms")
+    decimals = best_time(lambda: parse(documents["floats"], parse_float=Decimal), repeat=3)
+    print(f"  {'Decimal':<11} parse {decimals * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    bench_key_cache(records_document())
+    # no key repeats here, so the cache can only fill up to key_cache_size and stop: expect no gain
+    bench_key_cache(flat_object_document(), "a flat object with distinct keys")
+    bench_batch()
+    bench_numbers()
@@ -0,0 +1,56 @@
+import json
+import subprocess
+from datetime import datetime, timezone
+from django.core.management.base import BaseCommand, CommandError
+from json_parser.benchmarks import CORPORA, PARSERS, DEFAULT_SIZE, run_suite
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = "Benchmarks parse() against json.loads on generated corpora and the json.org files, as JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--corpus', action='append', choices=list(CORPORA), help="Corpus to run; repeat for several. Default: all.")
+        parser.add_argument('--parser', action='append', choices=list(PARSERS), help="Parser to run; repeat for several. Default: all.")
+        parser.add_argument('--size', type=int, default=DEFAULT_SIZE, help="Characters per generated corpus.")
+        parser.add_argument('--repeat', type=int, default=5, help="Timed runs per case; the fastest one counts.")
+        parser.add_argument('--no-rss', action='store_true', help="Skip peak RSS, which forks a process per case.")
+        parser.add_argument('--output', help="Write the JSON results to this file and print a summary instead.")
+        parser.add_argument('--compare', help="JSON results of an earlier run to compare MB/s against.")
+
+    def handle(self, *args, **options):
+        if options['size'] < 1 or options['repeat'] < 1:
+            raise CommandError("--size and --repeat must be positive.")
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as file:
+                baseline = {(case['corpus'], case['parser']): case for case in json.load(file)['results']}
+
+        report = run_suite(options['corpus'], options['parser'], options['size'], options['repeat'], not options['no_rss'])
+        report['commit'] = git_commit()
+        report['date'] = datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+        if not options['output']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+        with open(options['output'], 'w') as file:
+            json.dump(report, file, indent=2)
+        self.write_summary(report['results'], baseline)
+
+    def write_summary(self, results, baseline):
+        loads = {case['corpus']: case['seconds'] for case in results if case['parser'] == 'json.loads'}
+        self.stdout.write(f"{'corpus':<16}{'parser':<12}{'MB/s':>9}{'docs/s':>11}{'peak MB':>9}{'vs json':>9}{'vs base':>9}")
+        for case in results:
+            relative = f"{case['seconds'] / loads[case['corpus']]:.1f}x" if case['corpus'] in loads else '-'
+            previous = baseline.get((case['corpus'], case['parser'])) if baseline else None
+            change = f"{case['mb_per_s'] / previous['mb_per_s'] - 1:+.0%}" if previous else '-'
+            self.stdout.write(
+                f"{case['corpus']:<16}{case['parser']:<12}{case['mb_per_s']:>9.2f}{case['docs_per_s']:>11.1f}"
+                f"{case['peak_allocated_bytes'] / 1e6:>9.2f}{relative:>9}{change:>9}"
+            )
@@ -1,2 +1,17 @@
-from .json_parser import parse
-from .scanner import Scanner, Token, TokenType
\ No newline at end of file
+from .json_parser import parse, parse_many, Parser
+from .fast_parser import parse_fast
+from .incremental import IncrementalParser
+from .event_parser import iterparse, items
+from .extract import extract
+from .file_parser import parse_file, iterparse_file
+from .cache import parse_cached, ParseCache
+from .batch import parse_batch, parse_ndjson
+from .parallel import parse_parallel, parse_file_parallel
+from .structural import StructuralIndex
+from .lazy import parse_lazy
+from .columnar import parse_columnar
+from .validate import validate, JSONError
+from .schema import SchemaParser, compile_schema
+from .serializer import dumps, dump, iterdumps
+from .profiling import profile, ParseStats, ProfilingParser
+from .scanner import Scanner, Token, TokenType
@@ -0,0 +1,68 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import IO, Iterable, Iterator, List, Sequence, Tuple
+from .json_parser import JSONValue, Parser
+from .scanner import MAX_DEPTH
+
+CHUNK_SIZE = 500 # documents sent to a worker process at a time
+
+
+def parse_batch(json_strings: Iterable[str | bytes], workers: int | None = None, chunk_size: int = CHUNK_SIZE, max_depth: int = MAX_DEPTH) -> List[JSONValue]:
+    # Parses independent documents on a pool of worker processes. Results keep the input
+    # order, and an error names the 0-based index of the document that failed.
+    chunks = numbered_chunks(enumerate(json_strings), chunk_size)
+    return list(parse_chunks(chunks, "Document", workers, max_depth))
+
+
+def parse_ndjson(source: str | os.PathLike | IO, workers: int | None = None, chunk_size: int = CHUNK_SIZE, max_depth: int = MAX_DEPTH) -> Iterator[JSONValue]:
+    # Yields the value on each non-blank line of a newline-delimited JSON file or stream,
+    # in order. An error names the 1-based line number it was found on.
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as stream:
+            yield from parse_ndjson(stream, workers, chunk_size, max_depth)
+        return
+
+    lines = ((number, line) for number, line in enumerate(source, 1) if line.strip())
+    yield from parse_chunks(numbered_chunks(lines, chunk_size), "Line", workers, max_depth)
+
+
+def numbered_chunks(documents: Iterable[Tuple[int, str | bytes]], chunk_size: int) -> Iterator[Tuple[Sequence[int], Sequence[str | bytes]]]:
+    documents = iter(documents)
+    while chunk := list(islice(documents, chunk_size)):
+        numbers, json_strings = zip(*chunk)
+        yield numbers, json_strings
+
+
+def parse_chunks(chunks: Iterator[Tuple[Sequence[int], Sequence[str | bytes]]], label: str, workers: int | None, max_depth: int) -> Iterator[JSONValue]:
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for numbers, json_strings in chunks:
+            yield from parse_chunk(label, numbers, json_strings, max_depth)
+        return
+
+    executor = ProcessPoolExecutor(workers)
+    pending = deque()
+    try:
+        for numbers, json_strings in chunks:
+            pending.append(executor.submit(parse_chunk, label, numbers, json_strings, max_depth))
+            # keep a couple of chunks per worker in flight so a long stream isn't read into memory at once
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def parse_chunk(label: str, numbers: Sequence[int], json_strings: Sequence[str | bytes], max_depth: int) -> List[JSONValue]:
+    # Runs in a worker process; one Parser per chunk so its key cache is shared by the chunk
+    parser = Parser(max_depth)
+    results = []
+    for number, json_string in zip(numbers, json_strings):
+        try:
+            results.append(parser.parse(json_string))
+        except Exception as e:
+            raise Exception(f"{label} {number}: {e}") from None
+    return results
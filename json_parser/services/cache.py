@@ -0,0 +1,159 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Dict
+from .json_parser import JSONValue, Parser, check_input
+from .scanner import MAX_DEPTH
+
+MAX_ENTRIES = 256
+MAX_BYTES = 16 * 1024 * 1024 # total size of the cached input documents
+TIMEOUT = 300 # seconds, only used with a Django cache backend
+
+BACKEND_PREFIX = 'json_parser:'
+
+
+def parse_cached(json_string: str | bytes, frozen: bool = False) -> JSONValue:
+    # parse() through the shared cache configured by settings.JSON_PARSER_CACHE
+    return get_default_cache().parse(json_string, frozen)
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> 'ParseCache':
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ParseCache(**cache_settings())
+        return _default_cache
+
+
+def cache_settings() -> Dict[str, Any]:
+    # settings.JSON_PARSER_CACHE, e.g. {'MAX_ENTRIES': 512, 'MAX_BYTES': 8_000_000, 'BACKEND': 'default'}
+    try:
+        from django.conf import settings
+        options = getattr(settings, 'JSON_PARSER_CACHE', {}) if settings.configured else {}
+    except ImportError:
+        options = {}
+    return {
+        'max_entries': options.get('MAX_ENTRIES', MAX_ENTRIES),
+        'max_bytes': options.get('MAX_BYTES', MAX_BYTES),
+        'max_depth': options.get('MAX_DEPTH', MAX_DEPTH),
+        'backend': options.get('BACKEND'),
+        'timeout': options.get('TIMEOUT', TIMEOUT),
+    }
+
+
+def content_key(json_string: str | bytes) -> tuple[str, int]:
+    # Returns the cache key and the size of the input in bytes
+    data = json_string.encode('utf-8', 'surrogatepass') if isinstance(json_string, str) else memoryview(json_string).cast('B')
+    # str and bytes input can parse differently (a BOM is only skipped in bytes)
+    kind = 's' if isinstance(json_string, str) else 'b'
+    return kind + hashlib.blake2b(data, digest_size=16).hexdigest(), len(data)
+
+
+def freeze(value: JSONValue) -> Any:
+    # Read-only view of a parsed value that can be handed to every caller
+    if value.__class__ is dict:
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if value.__class__ is list:
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> JSONValue:
+    # Fresh dicts and lists from a frozen value; strings and numbers are immutable and shared
+    if value.__class__ is MappingProxyType:
+        return {key: thaw(item) for key, item in value.items()}
+    if value.__class__ is tuple:
+        return [thaw(item) for item in value]
+    return value
+
+
+class ParseCache:
+    # LRU cache of parsed documents keyed by a hash of their content. Entries are evicted
+    # when there are more than max_entries of them or their inputs add up to more than
+    # max_bytes. Results are either frozen (shared, read-only) or fresh copies, so no
+    # caller can change what the next one gets. With backend set to a Django cache alias
+    # the entries live in that cache instead, and its own expiry applies.
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES, max_depth: int = MAX_DEPTH, backend: str | None = None, timeout: int | None = TIMEOUT):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.parser = Parser(max_depth)
+        self.backend = backend
+        self.timeout = timeout
+        self.entries: OrderedDict[str, tuple[Any, int]] = OrderedDict() # key -> (frozen value, input size)
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock() # guards entries and counters
+        self.parse_lock = threading.Lock() # the Parser is reused, so one parse at a time
+
+    def parse(self, json_string: str | bytes, frozen: bool = False) -> JSONValue:
+        check_input(json_string)
+        key, size = content_key(json_string)
+        value = self.get(key)
+        if value is None: # documents are always an object or array, never null
+            with self.lock:
+                self.misses += 1
+            with self.parse_lock:
+                result = self.parser.parse(json_string) # invalid documents raise and are not cached
+            value = freeze(result)
+            self.put(key, value, size)
+        return value if frozen else thaw(value)
+
+    def get(self, key: str) -> Any:
+        if self.backend is not None:
+            stored = self.backend_cache().get(BACKEND_PREFIX + key)
+            value = None if stored is None else freeze(stored)
+        else:
+            with self.lock:
+                entry = self.entries.get(key)
+                value = None
+                if entry is not None:
+                    self.entries.move_to_end(key)
+                    value = entry[0]
+        if value is not None:
+            with self.lock:
+                self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any, size: int):
+        if self.backend is not None:
+            self.backend_cache().set(BACKEND_PREFIX + key, thaw(value), self.timeout)
+            return
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                return
+            self.entries[key] = (value, size)
+            self.size += size
+            while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.size -= evicted_size
+                self.evictions += 1
+
+    def backend_cache(self):
+        from django.core.cache import caches
+        return caches[self.backend]
+
+    def clear(self):
+        # Entries in a Django backend are shared with the rest of the site and left to expire
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self.entries),
+                'bytes': self.size,
+            }
@@ -0,0 +1,180 @@
+import re
+from typing import Any, Dict, List
+from .json_parser import decode_input
+from .fast_parser import FastParser, check_max_depth
+from .scanner import KEYWORDS, MAX_DEPTH, KEY_CACHE_SIZE, NUMBER_START
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+NUMBER = r'-?(?:0|[1-9][0-9]*+)(?:\.[0-9]++)?(?:[eE][+-]?[0-9]++)?'
+# A whole array of numbers, brackets included
+NUMBER_ARRAY = re.compile(rf'\[[ \t\n\r]*+(?:{NUMBER}(?:[ \t\n\r]*+,[ \t\n\r]*+{NUMBER})*+[ \t\n\r]*+)?\]')
+FLOAT_MARK = re.compile(r'[.eE]')
+LONG_INT = re.compile(r'[0-9]{19}') # may not fit in int64
+MAX_EXACT_INT = 2 ** 53 # larger integers change value as float64
+
+# What a column of records holds, as bit flags
+NUMBERS, STRINGS, BOOLEANS, NULLS = 1, 2, 4, 8
+
+
+def parse_columnar(json_string: str | bytes, max_depth: int = MAX_DEPTH, key_cache_size: int = KEY_CACHE_SIZE) -> Any:
+    # Like parse_fast, but arrays of numbers become numpy.ndarray and arrays of flat records
+    # with the same keys become a dict of column arrays. Numbers in those arrays are
+    # converted in bulk from their text and never become Python ints or floats.
+    if numpy is None:
+        raise ImportError("parse_columnar requires NumPy.")
+    check_max_depth(max_depth)
+    json_string = decode_input(json_string)
+    return ColumnarParser(json_string, max_depth, {} if key_cache_size > 0 else None, key_cache_size).parse()
+
+
+def number_array(text: str) -> 'numpy.ndarray | None':
+    # text is comma separated JSON numbers; None if an integer might not fit in int64
+    if FLOAT_MARK.search(text) is not None:
+        return numpy.fromstring(text, dtype=numpy.float64, sep=',')
+    if LONG_INT.search(text) is not None:
+        return None
+    return numpy.fromstring(text, dtype=numpy.int64, sep=',')
+
+
+def column_array(values: List[Any], kinds: int) -> 'numpy.ndarray | None':
+    # None if the column can't be one array without changing its values
+    if kinds == NUMBERS:
+        return number_array(','.join(values))
+    if kinds == NUMBERS | NULLS:
+        # nulls in a numeric column become NaN
+        present = [position for position, value in enumerate(values) if value is not None]
+        numbers = number_array(','.join([values[position] for position in present]))
+        if numbers is None:
+            return None
+        if numbers.dtype == numpy.int64 and ((numbers > MAX_EXACT_INT) | (numbers < -MAX_EXACT_INT)).any():
+            return None # NaN needs a float column, and these integers don't survive the conversion
+        column = numpy.full(len(values), numpy.nan)
+        column[present] = numbers
+        return column
+    if kinds & NUMBERS:
+        return None # numbers mixed with strings or booleans, left as records
+    if kinds == BOOLEANS:
+        return numpy.array(values, dtype=bool)
+    return numpy.array(values, dtype=object)
+
+
+class ColumnarParser(FastParser):
+
+    def parse_array(self) -> Any:
+        match = NUMBER_ARRAY.match(self.json_string, self.current_position)
+        if match is not None and match.end() - match.start() > 2:
+            numbers = number_array(self.json_string[match.start() + 1:match.end() - 1])
+            if numbers is not None:
+                self.increase_depth()
+                self.decrease_depth()
+                self.line += self.json_string.count('\n', match.start(), match.end())
+                self.current_position = match.end()
+                return numbers
+
+        records = self.parse_records()
+        if records is not None:
+            return records
+        return super().parse_array()
+
+    def parse_records(self) -> Dict[str, Any] | None:
+        # Reads an array of flat objects that all have the same keys in the same order into
+        # columns. Anything else rewinds and returns None, leaving the array to parse_array.
+        saved = (self.current_position, self.line, self.current_depth)
+        self.increase_depth()
+        self.current_position += 1 # consume '['
+        self.skip_whitespace()
+        if self.peek() != '{':
+            self.current_position, self.line, self.current_depth = saved
+            return None
+
+        keys: List[str] = []
+        columns: List[List[Any]] = []
+        kinds: List[int] = []
+        while True:
+            if not self.read_record(keys, columns, kinds):
+                self.current_position, self.line, self.current_depth = saved
+                return None
+            self.skip_whitespace()
+            char = self.peek()
+            if char == ',':
+                self.current_position += 1
+                self.skip_whitespace()
+                if self.peek() != '{':
+                    self.current_position, self.line, self.current_depth = saved
+                    return None
+            elif char == ']':
+                break
+            else:
+                self.current_position, self.line, self.current_depth = saved
+                return None
+
+        result = {}
+        for key, values, kind in zip(keys, columns, kinds):
+            column = column_array(values, kind)
+            if column is None:
+                self.current_position, self.line, self.current_depth = saved
+                return None
+            result[key] = column
+        self.current_position += 1 # consume ']'
+        self.decrease_depth()
+        return result
+
+    def read_record(self, keys: List[str], columns: List[List[Any]], kinds: List[int]) -> bool:
+        # Appends one record's values to the columns; numbers are kept as their text.
+        # The first record decides the keys.
+        first = not keys
+        self.increase_depth()
+        self.current_position += 1 # consume '{'
+        self.skip_whitespace()
+        if self.peek() == '}':
+            return False
+        index = 0
+        while True:
+            if self.peek() != '"':
+                return False
+            self.current_position += 1
+            key = self.scan_string()
+            if first:
+                keys.append(key)
+                columns.append([])
+                kinds.append(0)
+            elif index >= len(keys) or keys[index] != key:
+                return False
+            self.skip_whitespace()
+            if self.peek() != ':':
+                return False
+            self.current_position += 1
+            self.skip_whitespace()
+
+            char = self.peek()
+            if char == '"':
+                self.current_position += 1
+                value, kind = self.scan_string(), STRINGS
+            elif char in NUMBER_START:
+                self.current_position += 1
+                value, kind = self.scan_number(), NUMBERS
+            elif char.isalpha():
+                self.current_position += 1
+                value = KEYWORDS[self.scan_keyword()]
+                kind = NULLS if value is None else BOOLEANS
+            else:
+                return False # nested value
+            columns[index].append(value)
+            kinds[index] |= kind
+            index += 1
+
+            self.skip_whitespace()
+            char = self.peek()
+            if char == ',':
+                self.current_position += 1
+                self.skip_whitespace()
+            elif char == '}':
+                self.current_position += 1
+                self.decrease_depth()
+                return index == len(keys)
+            else:
+                return False
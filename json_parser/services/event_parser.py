@@ -0,0 +1,110 @@
+from typing import Any, Callable, Iterator, Tuple
+from .json_parser import JSONValue, JSONObject, JSONArray, Parser, check_input, COLON, AFTER_VALUE, DONE
+from .scanner import Token, TokenType, MAX_DEPTH, KEY_CACHE_SIZE
+
+Event = Tuple[str, str, Any]
+
+SCALAR_EVENTS = {str: 'string', int: 'number', float: 'number', bool: 'boolean', type(None): 'null'}
+
+
+def iterparse(json_string: str | bytes, max_depth: int = MAX_DEPTH, key_cache_size: int = KEY_CACHE_SIZE, parse_int: Callable[[str], Any] | None = None, parse_float: Callable[[str], Any] | None = None) -> Iterator[Event]:
+    # Yields (event, path, value) as the document is scanned. Paths are dotted keys, with
+    # 'item' standing for any array element, e.g. 'orders.item.total'.
+    check_input(json_string)
+
+    parser = EventParser(max_depth, key_cache_size, parse_int, parse_float)
+    scanner = parser.scanner = parser.make_scanner(json_string)
+    events = parser.events
+    done = False
+    while not done:
+        done = parser.accept(scanner.advance_token())
+        yield from events
+        events.clear()
+    parser.accept(scanner.advance_token()) # only EOF may follow the main object/array
+
+
+def items(json_string: str | bytes, prefix: str, max_depth: int = MAX_DEPTH) -> Iterator[JSONValue]:
+    # Builds and yields each value found at prefix, one at a time
+    stack: list[JSONObject | JSONArray] = [] # containers of the value being built
+    key = None
+    for event, path, value in iterparse(json_string, max_depth):
+        if not stack and (path != prefix or event in ('map_key', 'end_map', 'end_array')):
+            continue
+
+        match event:
+            case 'map_key':
+                key = value
+                continue
+            case 'start_map' | 'start_array':
+                container = {} if event == 'start_map' else []
+                if stack:
+                    add_to(stack[-1], key, container)
+                stack.append(container)
+                continue
+            case 'end_map' | 'end_array':
+                value = stack.pop()
+                if not stack:
+                    yield value
+                continue
+
+        if stack:
+            add_to(stack[-1], key, value)
+        else:
+            yield value
+
+
+def add_to(container: JSONObject | JSONArray, key: str | None, value: JSONValue):
+    if container.__class__ is list:
+        container.append(value)
+    else:
+        container[key] = value
+
+
+class EventParser(Parser):
+    # Runs the Parser grammar but reports events instead of filling containers, so memory
+    # does not grow with the size of the document. The stack only holds empty containers
+    # that mark whether each open level is an object or an array.
+    __slots__ = ('events', 'paths')
+
+    def reset(self):
+        super().reset()
+        self.events: list[Event] = []
+        self.paths: list[str] = [] # path of each open container
+
+    def accept(self, token: Token) -> bool:
+        done = super().accept(token)
+        if token.token_type == TokenType.STRING and self.state == COLON:
+            self.events.append(('map_key', self.paths[-1], self.key))
+        return done
+
+    def value_path(self) -> str:
+        if not self.stack:
+            return ''
+        child = 'item' if self.stack[-1].__class__ is list else self.key
+        parent = self.paths[-1]
+        return f"{parent}.{child}" if parent else child
+
+    def open(self, container: JSONObject | JSONArray):
+        path = self.value_path()
+        super().open(container)
+        self.paths.append(path)
+        self.events.append(('start_map' if container.__class__ is dict else 'start_array', path, None))
+
+    def close(self) -> bool:
+        self.scanner.decrease_depth()
+        container = self.stack.pop()
+        self.key = self.keys.pop()
+        self.events.append(('end_map' if container.__class__ is dict else 'end_array', self.paths.pop(), None))
+        return self.value_done()
+
+    def add_value(self, value: JSONValue) -> bool:
+        # anything else came from a parse_int/parse_float hook
+        self.events.append((SCALAR_EVENTS.get(value.__class__, 'number'), self.value_path(), value))
+        return self.value_done()
+
+    def value_done(self) -> bool:
+        if not self.stack:
+            self.state = DONE
+            return True
+        self.state = AFTER_VALUE
+        return False
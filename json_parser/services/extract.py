@@ -0,0 +1,232 @@
+import re
+from typing import Dict, Iterable, List
+from .json_parser import JSONValue, decode_input
+from .fast_parser import FastParser, check_max_depth
+from .scanner import MAX_DEPTH, NUMBER_START
+
+# A whole string with its escapes left encoded
+STRING_SKIP = re.compile(r'"(?:[^"\\\x00-\x1f]++|\\.)*+"')
+# Everything up to the next bracket, jumping over whole strings. A captured quote means the
+# string that starts there is unterminated or holds a control character.
+SKIP_TO_BRACKET = re.compile(r'(?:[^"\[\]{}]++|"(?:[^"\\\x00-\x1f]++|\\.)*+")*+([\[\]{}"])')
+CLOSERS = {'{': '}', '[': ']'}
+PATH_SEGMENT = re.compile(r"\.([^.\[\]]+)|\[(\d+)\]|\['((?:[^'\\]|\\.)*)'\]")
+
+END = None # key in a path trie node holding the requested paths that end at that node
+
+
+def extract(json_string: str | bytes, paths: Iterable[str], max_depth: int = MAX_DEPTH) -> Dict[str, JSONValue]:
+    # Returns {path: value} for the requested paths that exist in the document. Everything
+    # else is skipped without being decoded or built, but still checked for balanced brackets
+    # and terminated strings.
+    check_max_depth(max_depth)
+    json_string = decode_input(json_string)
+    return Extractor(json_string, max_depth).extract(path_trie(paths))
+
+
+def path_trie(paths: Iterable[str]) -> dict:
+    trie = {}
+    for path in paths:
+        node = trie
+        for segment in parse_path(path):
+            node = node.setdefault(segment, {})
+        node.setdefault(END, []).append(path)
+    return trie
+
+
+def parse_path(path: str) -> List[str]:
+    # JSON Pointer ('/payload/user/id') or dotted JSONPath ('$.payload.user.id', 'items[0].id').
+    # Array indices are kept as strings and matched against element positions.
+    if path == '' or path.startswith('/'):
+        return [segment.replace('~1', '/').replace('~0', '~') for segment in path.split('/')[1:]]
+
+    if path.startswith('$'):
+        path = path[1:]
+    elif path and path[0] not in '.[':
+        path = '.' + path
+    segments = []
+    position = 0
+    while position < len(path):
+        match = PATH_SEGMENT.match(path, position)
+        if match is None:
+            raise Exception(f"Invalid path: {path!r} at character {position}.")
+        key, index, quoted = match.groups()
+        if quoted is not None:
+            key = re.sub(r"\\(.)", r"\1", quoted)
+        segments.append(key if index is None else index)
+        position = match.end()
+    return segments
+
+
+def lookup(value: JSONValue, node: dict, found: Dict[str, JSONValue]):
+    # Resolves paths that continue below a value that was already built
+    for path in node.get(END, ()):
+        found[path] = value
+    for segment, child in node.items():
+        if segment is END:
+            continue
+        if isinstance(value, dict) and segment in value:
+            lookup(value[segment], child, found)
+        elif isinstance(value, list) and segment.isdigit() and int(segment) < len(value):
+            lookup(value[int(segment)], child, found)
+
+
+def forget(node: dict, found: Dict[str, JSONValue]):
+    # Drops the paths at and below a node, for a repeated key whose last value replaces them
+    for segment, child in node.items():
+        if segment is END:
+            for path in child:
+                found.pop(path, None)
+        else:
+            forget(child, found)
+
+
+class Extractor(FastParser):
+    # Walks the document following a trie of requested paths. Values at the end of a path are
+    # built with FastParser.parse_value; every other value is skipped.
+
+    def extract(self, trie: dict) -> Dict[str, JSONValue]:
+        self.found: Dict[str, JSONValue] = {}
+        self.check_start()
+        self.walk(trie)
+
+        self.skip_whitespace()
+        if not self.is_at_end(): #check for extra values after main object/array closed
+            extra_token = self.next_token()
+            raise Exception(f"Invalid JSON: Extra value after close at line {self.line}, token type: {extra_token.token_type}.")
+        return self.found
+
+    def walk(self, node: dict):
+        if END in node:
+            lookup(self.parse_value(), node, self.found)
+            return
+        self.skip_whitespace()
+        char = self.peek()
+        if char == '{':
+            self.walk_object(node)
+        elif char == '[':
+            self.walk_array(node)
+        else:
+            self.skip_value()
+
+    def walk_object(self, node: dict):
+        self.increase_depth()
+        self.current_position += 1 # consume '{'
+        self.skip_whitespace()
+        if self.peek() == '}':
+            self.current_position += 1
+            self.decrease_depth()
+            return
+        seen = set() # requested keys met so far; like parse(), the last repeat wins
+        while True:
+            if self.peek() != '"':
+                return self.error("Expected string")
+            self.current_position += 1
+            key = self.scan_string()
+            child = node.get(key)
+            self.skip_whitespace()
+            if self.peek() != ':':
+                return self.error("Expected colon")
+            self.current_position += 1
+            if child is not None:
+                if key in seen:
+                    forget(child, self.found)
+                seen.add(key)
+            if child is None:
+                self.skip_value()
+            else:
+                self.walk(child)
+
+            self.skip_whitespace()
+            char = self.peek()
+            if char == ',':
+                self.current_position += 1
+                self.skip_whitespace()
+                if self.peek() == '}':
+                    return self.error("Unexpected trailing comma")
+            elif char == '}':
+                self.current_position += 1
+                self.decrease_depth()
+                return
+            else:
+                return self.error("Expected ',' or '}', but found something else.")
+
+    def walk_array(self, node: dict):
+        self.increase_depth()
+        self.current_position += 1 # consume '['
+        self.skip_whitespace()
+        if self.peek() == ']':
+            self.current_position += 1
+            self.decrease_depth()
+            return
+        index = 0
+        while True:
+            child = node.get(str(index))
+            if child is None:
+                self.skip_value()
+            else:
+                self.walk(child)
+            index += 1
+
+            self.skip_whitespace()
+            char = self.peek()
+            if char == ',':
+                self.current_position += 1
+                self.skip_whitespace()
+                if self.peek() == ']':
+                    return self.error("Unexpected trailing comma")
+            elif char == ']':
+                self.current_position += 1
+                self.decrease_depth()
+                return
+            else:
+                return self.error("Expected ',' or ']', but found something else.")
+
+    def skip_value(self):
+        self.skip_whitespace()
+        char = self.peek()
+        if char == '"':
+            match = STRING_SKIP.match(self.json_string, self.current_position)
+            if match is None:
+                self.current_position += 1
+                self.scan_string() # raises the same error parse() would
+            self.current_position = match.end()
+        elif char == '{' or char == '[':
+            self.skip_container()
+        elif char in NUMBER_START:
+            self.current_position += 1
+            self.scan_number()
+        elif char.isalpha():
+            self.current_position += 1
+            self.scan_keyword()
+        else:
+            self.error("Unexpected input")
+
+    def skip_container(self):
+        # Balances brackets between the opening one and its match, jumping over whole strings
+        start = self.current_position
+        expected = []
+        for match in SKIP_TO_BRACKET.finditer(self.json_string, start):
+            token = match.group(1)
+            if token in CLOSERS:
+                if self.current_depth + len(expected) + 1 >= self.max_depth:
+                    self.line += self.json_string.count('\n', start, match.start(1))
+                    self.current_position = match.start(1)
+                    self.current_depth += len(expected)
+                    self.increase_depth() # raises the depth error
+                expected.append(CLOSERS[token])
+                continue
+            if token == '"':
+                self.line += self.json_string.count('\n', start, match.start(1))
+                self.current_position = match.start(1) + 1
+                self.scan_string() # raises the same error parse() would
+            if expected.pop() != token:
+                self.line += self.json_string.count('\n', start, match.start(1))
+                self.current_position = match.start(1)
+                self.error("Mismatched closing bracket")
+            if not expected:
+                self.current_position = match.end()
+                self.line += self.json_string.count('\n', start, self.current_position)
+                return
+        self.current_position = len(self.json_string)
+        self.error("Unexpected end of input")
@@ -0,0 +1,141 @@
+import re
+import sys
+from typing import Any, Callable
+from .json_parser import JSONValue, JSONObject, JSONArray, decode_input
+from .scanner import Scanner, TokenType, KEYWORDS, MAX_DEPTH, KEY_CACHE_SIZE, SMALL_INTS, NUMBER_START
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+# FastParser and its subclasses descend into containers by recursion
+FRAMES_PER_LEVEL = 3 # at most, for ColumnarParser's arrays
+RECURSION_HEADROOM = 100 # frames left for the caller and the scanner's own calls
+
+
+def parse_fast(json_string: str | bytes, key_cache_size: int = KEY_CACHE_SIZE, parse_int: Callable[[str], Any] | None = None, parse_float: Callable[[str], Any] | None = None) -> JSONValue:
+    json_string = decode_input(json_string)
+    return FastParser(json_string, MAX_DEPTH, {} if key_cache_size > 0 else None, key_cache_size, parse_int, parse_float).parse()
+
+
+def check_max_depth(max_depth: int):
+    # For entry points that take a max_depth: refuse one that Python's recursion limit can't
+    # reach, instead of failing with a RecursionError part way into a deep document
+    limit = (sys.getrecursionlimit() - RECURSION_HEADROOM) // FRAMES_PER_LEVEL
+    if max_depth > limit:
+        raise Exception(f"max_depth can be at most {limit} here, deeper documents would exceed Python's recursion limit. parse() has no such limit.")
+
+
+class FastParser(Scanner):
+    # Single pass engine: builds dicts and lists straight from the characters, reusing the
+    # Scanner's string/number/keyword rules but never creating Token objects.
+
+    def parse(self) -> JSONValue:
+        self.check_start()
+        result = self.parse_value()
+
+        self.skip_whitespace()
+        if not self.is_at_end(): #check for extra values after main object/array closed
+            extra_token = self.next_token()
+            raise Exception(f"Invalid JSON: Extra value after close at line {self.line}, token type: {extra_token.token_type}.")
+        return result
+
+    def increase_depth(self):
+        self.current_depth += 1
+        if self.current_depth >= self.max_depth:
+            raise Exception(f"Maximum depth exceeded. Maximum depth is {self.max_depth}. Current depth is at {self.current_depth} at line {self.line} and position {self.current_position}, token type: {TokenType.LBRACE if self.peek() == '{' else TokenType.LBRACKET}")
+
+    def skip_whitespace(self):
+        end = WHITESPACE.match(self.json_string, self.current_position).end()
+        if end != self.current_position:
+            self.line += self.json_string.count('\n', self.current_position, end)
+            self.current_position = end
+
+    def error(self, message: str) -> None:
+        # Only the failure path pays for a Token, so messages name the same token types as parse()
+        position = self.current_position
+        token = self.next_token()
+        if token.token_type == TokenType.EOF:
+            raise Exception(f"Invalid JSON: Unexpected end of input at line {self.line}.")
+        raise Exception(f"Invalid JSON: {message} at line {self.line} and position {position}, token type: {token.token_type}.")
+
+    def parse_value(self) -> JSONValue:
+        self.skip_whitespace()
+        char = self.peek()
+        if char == '"':
+            self.current_position += 1
+            return self.scan_string()
+        if char == '{':
+            return self.parse_object()
+        if char == '[':
+            return self.parse_array()
+        if char in NUMBER_START:
+            self.current_position += 1
+            num = self.scan_number()
+            # int or float as classified by scan_number, without searching the text again
+            if self.number_is_integer:
+                if self.parse_int is None:
+                    return SMALL_INTS[num] if len(num) < 4 else int(num)
+                return self.parse_int(num)
+            return float(num) if self.parse_float is None else self.parse_float(num)
+        if char.isalpha():
+            self.current_position += 1
+            return KEYWORDS[self.scan_keyword()]
+        return self.error("Unexpected input")
+
+    def parse_object(self) -> JSONObject:
+        self.increase_depth()
+        self.current_position += 1 # consume '{'
+        obj = {}
+        self.skip_whitespace()
+        if self.peek() == '}':
+            self.current_position += 1
+            self.decrease_depth()
+            return obj
+        while True:
+            if self.peek() != '"':
+                return self.error(f"Expected {TokenType.STRING}")
+            self.current_position += 1
+            key = self.scan_string()
+            self.skip_whitespace()
+            if self.peek() != ':':
+                return self.error(f"Expected {TokenType.COLON}")
+            self.current_position += 1
+            obj[key] = self.parse_value()
+
+            self.skip_whitespace()
+            char = self.peek()
+            if char == ',':
+                self.current_position += 1
+                self.skip_whitespace()
+                if self.peek() == '}':
+                    return self.error("Unexpected trailing comma")
+            elif char == '}':
+                self.current_position += 1
+                self.decrease_depth()
+                return obj
+            else:
+                return self.error("Expected ',' or '}', but found something else.")
+
+    def parse_array(self) -> JSONArray:
+        self.increase_depth()
+        self.current_position += 1 # consume '['
+        arr = []
+        self.skip_whitespace()
+        if self.peek() == ']':
+            self.current_position += 1
+            self.decrease_depth()
+            return arr
+        while True:
+            arr.append(self.parse_value())
+
+            self.skip_whitespace()
+            char = self.peek()
+            if char == ',':
+                self.current_position += 1
+                self.skip_whitespace()
+                if self.peek() == ']':
+                    return self.error("Unexpected trailing comma")
+            elif char == ']':
+                self.current_position += 1
+                self.decrease_depth()
+                return arr
+            else:
+                return self.error("Expected ',' or ']', but found something else.")
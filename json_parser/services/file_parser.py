@@ -0,0 +1,32 @@
+import mmap
+import os
+from typing import Iterator
+from .json_parser import JSONValue, Parser
+from .event_parser import Event, iterparse
+from .scanner import MAX_DEPTH
+
+
+def parse_file(path: str | os.PathLike, max_depth: int = MAX_DEPTH) -> JSONValue:
+    # The file is memory-mapped and scanned in place, so pages are read in as the scanner
+    # reaches them and no full-size copy of the file is made
+    with open(path, 'rb') as file:
+        mapped = map_file(file)
+        try:
+            return Parser(max_depth).parse(mapped)
+        finally:
+            mapped.close()
+
+
+def iterparse_file(path: str | os.PathLike, max_depth: int = MAX_DEPTH) -> Iterator[Event]:
+    with open(path, 'rb') as file:
+        mapped = map_file(file)
+        try:
+            yield from iterparse(mapped, max_depth)
+        finally:
+            mapped.close()
+
+
+def map_file(file) -> mmap.mmap:
+    if os.fstat(file.fileno()).st_size == 0:
+        raise Exception("Invalid JSON: Input is empty or contains only whitespace.") # empty files cannot be mapped
+    return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
@@ -0,0 +1,110 @@
+import codecs
+import re
+from typing import Any, Callable
+from .json_parser import JSONValue, Parser
+from .scanner import Scanner, Token, TokenType, MAX_DEPTH, KEY_CACHE_SIZE
+
+WHITESPACE = ' \t\n\r'
+
+# Tokens that may still grow when the next chunk arrives
+OPEN_ENDED = (TokenType.NUMBER, TokenType.BOOLEAN, TokenType.NULL)
+# The part of a string that cannot end it: plain characters and escaped pairs
+STRING_BODY = re.compile(r'(?:[^"\\\x00-\x1f]++|\\.)*+')
+
+
+class IncrementalParser:
+    # Push-style parser: chunks are scanned as they are fed and every complete token is handed
+    # to the Parser state machine straight away. Only the text of a token that is cut off by a
+    # chunk boundary is kept back until the rest of it arrives.
+    __slots__ = ('parser', 'scanner', 'decoder', 'pending', 'in_string', 'escaped', 'started', 'closed')
+
+    def __init__(self, max_depth: int = MAX_DEPTH, key_cache_size: int = KEY_CACHE_SIZE, parse_int: Callable[[str], Any] | None = None, parse_float: Callable[[str], Any] | None = None):
+        self.parser = Parser(max_depth, key_cache_size, parse_int, parse_float)
+        self.scanner = self.parser.scanner = Scanner('', max_depth, self.parser.key_cache, key_cache_size, parse_int, parse_float)
+        self.decoder = codecs.getincrementaldecoder('utf-8-sig')() # drops a leading BOM, like parse() does for bytes
+        self.pending: list[str] = []
+        self.in_string = False # the pending text is an unterminated string
+        self.escaped = False # ... which ends with a backslash whose escaped character is still to come
+        self.started = False # a non-whitespace character has been seen
+        self.closed = False
+
+    def feed(self, chunk: str | bytes):
+        if self.closed:
+            raise Exception("Invalid JSON: Cannot feed a closed parser.")
+        if isinstance(chunk, (bytes, bytearray, memoryview)):
+            chunk = self.decoder.decode(chunk)
+        elif not isinstance(chunk, str):
+            raise Exception("Invalid JSON: Input must be a valid JSON string")
+
+        self.pending.append(chunk)
+        # a string can only end with an unescaped quote, so only the new chunk is searched for one
+        # and the whole string is decoded once, when it arrives
+        if self.in_string and not self.string_ends(chunk):
+            return
+        self.scan(final=False)
+
+    def string_ends(self, text: str, position: int = 0) -> bool:
+        # True if text holds the closing quote of the pending string, or a character that makes it invalid
+        if self.escaped:
+            if not text:
+                return False
+            position += 1 # escaped by the backslash that ended the previous chunk
+        end = STRING_BODY.match(text, position).end()
+        if end < len(text) - 1 or (end == len(text) - 1 and text[end] != '\\'):
+            return True
+        self.escaped = end < len(text)
+        return False
+
+    def close(self) -> JSONValue:
+        if self.closed:
+            raise Exception("Invalid JSON: Cannot close a closed parser.")
+        self.pending.append(self.decoder.decode(b'', final=True))
+        self.closed = True
+        if not self.started and not ''.join(self.pending).strip():
+            raise Exception("Invalid JSON: Input is empty or contains only whitespace.")
+
+        self.scan(final=True)
+        return self.parser.result
+
+    def scan(self, final: bool):
+        scanner = self.scanner
+        buffer = scanner.json_string = ''.join(self.pending)
+        scanner.current_position = 0
+        self.pending = []
+        self.in_string = self.escaped = False
+
+        if not self.started:
+            if not buffer.strip() and not final:
+                self.pending.append(buffer) # whitespace so far; decide once there is something else
+                return
+            self.started = True
+            scanner.check_start()
+
+        while True:
+            try:
+                token = scanner.next_token()
+            except Exception:
+                # a token cut off by the end of the buffer may still be completed by the next chunk
+                if final or scanner.current_position < len(buffer):
+                    raise
+                token = None
+            if token is not None and not final and token.token_type in OPEN_ENDED and scanner.current_position == len(buffer):
+                token = None
+
+            if token is None:
+                self.pending.append(buffer[scanner.start:])
+                if buffer[scanner.start] == '"':
+                    self.in_string = True
+                    self.string_ends(buffer, scanner.start + 1)
+                return
+            if token.token_type == TokenType.EOF and not final:
+                return
+            self.push(token)
+            if token.token_type == TokenType.EOF:
+                return
+
+    def push(self, token: Token):
+        scanner = self.scanner
+        scanner.current_token = token
+        scanner.token_index += 1
+        self.parser.accept(token)
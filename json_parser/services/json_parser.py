@@ -1,119 +1,214 @@
-from typing import Any, Dict, Union, List
-from .scanner import Scanner, Token, TokenType
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Union, List
+import re
+from .scanner import Scanner, Token, TokenType, MAX_DEPTH, KEY_CACHE_SIZE, SMALL_INTS, BYTES_TYPES, UTF8_BOM, make_scanner
+
+if TYPE_CHECKING:
+    from .profiling import ParseStats # profiling imports this module
 
 JSONValue = Union[str, int, float, bool, None, 'JSONObject', 'JSONArray']
 JSONObject = Dict[str, JSONValue]
 JSONArray = List[JSONValue]
 
 
-def parse(json_string: str) -> JSONValue:
+# Whitespace-only UTF-8 input, optionally after a byte order mark
+BLANK_BYTES = re.compile(rb'(?:\xef\xbb\xbf)?[ \t\n\r\x0b\x0c]*')
+
+
+def check_input(json_string: str | bytes):
+    if isinstance(json_string, BYTES_TYPES):
+        if BLANK_BYTES.fullmatch(json_string):
+            raise Exception("Invalid JSON: Input is empty or contains only whitespace.")
+        return
     if not isinstance(json_string, str):
         raise Exception("Invalid JSON: Input must be a valid JSON string")
     if not json_string.strip():
         raise Exception("Invalid JSON: Input is empty or contains only whitespace.")
-    
-    scanner = Scanner(json_string)
-    tokens = scanner.scan_tokens()
-
-
-    def parse_object(scanner: Scanner) -> JSONObject:
-        scanner.increase_depth()
-        obj = {}
-        consume(scanner, TokenType.LBRACE)
-        if scanner.tokens[scanner.current_position].token_type == TokenType.RBRACE:
-            consume(scanner, TokenType.RBRACE)
-            return obj
-        while scanner.tokens[scanner.current_position].token_type != TokenType.RBRACE:
-            key = consume(scanner, TokenType.STRING).value
-            consume(scanner, TokenType.COLON)
-            value = parse_value(scanner)
-            obj[key] = value
-
-            next_token = scanner.tokens[scanner.current_position].token_type
-
-            if next_token == TokenType.COMMA:
-                consume(scanner, TokenType.COMMA)
-                if scanner.tokens[scanner.current_position].token_type == TokenType.RBRACE:
-                    return error(scanner.tokens[scanner.current_position], "Unexpected trailing comma")
-            elif next_token == TokenType.RBRACE:
-                break
-            else:
-                return error(scanner.tokens[scanner.current_position], "Expected ',' or '}', but found something else.")
-           
-        consume(scanner, TokenType.RBRACE)
-        scanner.decrease_depth()
-        return obj
-    
-    def parse_array(scanner: Scanner) -> JSONArray:
-        scanner.increase_depth()
-        arr = []
-        consume(scanner, TokenType.LBRACKET)
-        if scanner.tokens[scanner.current_position].token_type == TokenType.RBRACKET:
-            consume(scanner, TokenType.RBRACKET)
-            return arr
-        while scanner.tokens[scanner.current_position].token_type != TokenType.RBRACKET:
-            value = parse_value(scanner)
-            arr.append(value)
-            if scanner.tokens[scanner.current_position].token_type == TokenType.COMMA:
-                consume(scanner, TokenType.COMMA)
-                if scanner.tokens[scanner.current_position].token_type == TokenType.RBRACKET:
-                    return error(scanner.tokens[scanner.current_position], "Unexpected trailing comma")
-        consume(scanner, TokenType.RBRACKET)
-        scanner.decrease_depth()
-        return arr
-
-    def consume(scanner: Scanner, token_type: TokenType) -> Token:
-        if scanner.current_position >= len(scanner.tokens):
-            return error(None, "Unexpected end of input")
-        if scanner.tokens[scanner.current_position].token_type == token_type:
-            token = scanner.tokens[scanner.current_position]
-            scanner.current_position += 1
-            return token
-        else:
-            return error(scanner.tokens[scanner.current_position], f"Expected {token_type}")
 
-    def error(token: Token, message: str) -> None:
-        if token is None or token.token_type == TokenType.EOF:
-            raise Exception(f"Invalid JSON: Unexpected end of input at line {scanner.line}.")
-        raise Exception(f"Invalid JSON: {message} at line {scanner.line} and index {scanner.current_position}, token type: {token.token_type}.")
-    
-
-    def parse_value(scanner: Scanner) -> JSONValue:
-        if scanner.current_position >= len(scanner.tokens):
-            return error(None, "Unexpected end of input")
-        
-        token = scanner.tokens[scanner.current_position]
-        match token.token_type:
+
+def decode_input(json_string: str | bytes) -> str:
+    # For the engines that only scan str: UTF-8 input is decoded up front, after its BOM
+    check_input(json_string)
+    if not isinstance(json_string, BYTES_TYPES):
+        return json_string
+    with memoryview(json_string) as view, view.cast('B') as data:
+        start = len(UTF8_BOM) if data[:len(UTF8_BOM)] == UTF8_BOM else 0
+        try:
+            return str(data[start:], 'utf-8')
+        except UnicodeDecodeError as e:
+            line = bytes(data[start:start + e.start]).count(b'\n') + 1
+            raise Exception(f"Invalid JSON: Invalid UTF-8 at line {line}.") from None
+
+
+# What the parser expects next
+VALUE = 0           # any value: the top-level value or an object member's value
+FIRST_ELEMENT = 1   # a value or ']' right after '['
+NEXT_ELEMENT = 2    # a value after ',' in an array
+FIRST_KEY = 3       # a key or '}' right after '{'
+NEXT_KEY = 4        # a key after ',' in an object
+COLON = 5
+AFTER_VALUE = 6     # ',' or the closing bracket of the innermost container
+DONE = 7
+
+
+def parse(json_string: str | bytes, max_depth: int = MAX_DEPTH, key_cache_size: int = KEY_CACHE_SIZE, parse_int: Callable[[str], Any] | None = None, parse_float: Callable[[str], Any] | None = None, schema: dict | None = None, stats: 'ParseStats | None' = None) -> JSONValue:
+    if stats is not None:
+        # see profiling.ParseStats; without stats the plain Parser runs, uninstrumented
+        if schema is not None:
+            raise Exception("Cannot collect stats while checking a schema.")
+        from .profiling import ProfilingParser
+        return ProfilingParser(stats, max_depth, key_cache_size, parse_int, parse_float).parse(json_string)
+    if schema is not None:
+        # checked while the values are built; see schema.compile_schema for the supported keywords
+        from .schema import SchemaParser
+        return SchemaParser(schema, max_depth, key_cache_size, parse_int, parse_float).parse(json_string)
+    return Parser(max_depth, key_cache_size, parse_int, parse_float).parse(json_string)
+
+
+def parse_many(json_strings: Iterable[str | bytes], max_depth: int = MAX_DEPTH, key_cache_size: int = KEY_CACHE_SIZE, parse_int: Callable[[str], Any] | None = None, parse_float: Callable[[str], Any] | None = None, stats: 'ParseStats | None' = None) -> List[JSONValue]:
+    if stats is not None:
+        from .profiling import ProfilingParser
+        parser = ProfilingParser(stats, max_depth, key_cache_size, parse_int, parse_float)
+    else:
+        parser = Parser(max_depth, key_cache_size, parse_int, parse_float) # one key cache for every document
+    return [parser.parse(json_string) for json_string in json_strings]
+
+
+class Parser:
+    # Reusable across documents. Nesting is tracked on an explicit stack of open containers
+    # instead of the Python call stack, so depth is bounded only by max_depth. Object keys
+    # are interned in a cache that outlives each document; key_cache_size=0 turns it off.
+    __slots__ = ('scanner', 'max_depth', 'key_cache', 'key_cache_size', 'parse_int', 'parse_float', 'state', 'stack', 'keys', 'key', 'result')
+
+    def __init__(self, max_depth: int = MAX_DEPTH, key_cache_size: int = KEY_CACHE_SIZE, parse_int: Callable[[str], Any] | None = None, parse_float: Callable[[str], Any] | None = None):
+        self.scanner: Scanner | None = None
+        self.max_depth = max_depth
+        self.key_cache: Dict[str | bytes, str] | None = {} if key_cache_size > 0 else None
+        self.key_cache_size = key_cache_size
+        self.parse_int = parse_int # e.g. decimal.Decimal for parse_float; called with the number's text
+        self.parse_float = parse_float
+        self.reset()
+
+    def reset(self):
+        self.state = VALUE
+        self.stack: List[JSONObject | JSONArray] = []
+        self.keys: List[str | None] = [] # key each open container will be stored under in its parent
+        self.key: str | None = None
+        self.result: JSONValue = None
+
+    def parse(self, json_string: str | bytes) -> JSONValue:
+        check_input(json_string)
+
+        scanner = self.scanner = self.make_scanner(json_string)
+        self.reset()
+        try:
+            token = scanner.advance_token()
+            while not self.accept(token):
+                token = scanner.advance_token()
+
+            self.accept(scanner.advance_token()) # only EOF may follow the main object/array
+            return self.result
+        finally:
+            self.scanner = None
+            self.stack = []
+
+    def make_scanner(self, json_string: str | bytes) -> Scanner:
+        # The scanner a document is read with; subclasses override it to swap in their own
+        return make_scanner(json_string, self.max_depth, self.key_cache, self.key_cache_size, self.parse_int, self.parse_float)
+
+    def accept(self, token: Token) -> bool:
+        # Advance the state machine by one token; returns True once the top-level value is complete
+        state = self.state
+        token_type = token.token_type
+
+        if state == AFTER_VALUE:
+            container = self.stack[-1]
+            if token_type == TokenType.COMMA:
+                self.state = NEXT_ELEMENT if container.__class__ is list else NEXT_KEY
+                return False
+            if container.__class__ is list:
+                if token_type == TokenType.RBRACKET:
+                    return self.close()
+                return self.error(token, "Expected ',' or ']', but found something else.")
+            if token_type == TokenType.RBRACE:
+                return self.close()
+            return self.error(token, "Expected ',' or '}', but found something else.")
+
+        if state == FIRST_KEY or state == NEXT_KEY:
+            if token_type == TokenType.STRING:
+                self.key = token.value
+                self.state = COLON
+                return False
+            if token_type == TokenType.RBRACE:
+                if state == FIRST_KEY:
+                    return self.close()
+                return self.error(token, "Unexpected trailing comma")
+            return self.error(token, f"Expected {TokenType.STRING}")
+
+        if state == COLON:
+            if token_type == TokenType.COLON:
+                self.state = VALUE
+                return False
+            return self.error(token, f"Expected {TokenType.COLON}")
+
+        if state == DONE: #check for extra tokens after main object/array closed
+            if token_type != TokenType.EOF:
+                raise Exception(f"Invalid JSON: Extra value after close at line {self.scanner.line}, token type: {token_type}.")
+            return True
+
+        # VALUE, FIRST_ELEMENT or NEXT_ELEMENT
+        match token_type:
+            case TokenType.STRING | TokenType.BOOLEAN | TokenType.NULL:
+                return self.add_value(token.value)
+            case TokenType.NUMBER:
+                # int or float as classified by scan_number, without searching the text again
+                num = token.value
+                if self.scanner.number_is_integer:
+                    if self.parse_int is None:
+                        return self.add_value(SMALL_INTS[num] if len(num) < 4 else int(num))
+                    return self.add_value(self.parse_int(num))
+                return self.add_value(float(num) if self.parse_float is None else self.parse_float(num))
             case TokenType.LBRACE:
-                return parse_object(scanner)
+                self.open({})
+                self.state = FIRST_KEY
+                return False
             case TokenType.LBRACKET:
-                return parse_array(scanner)
-            case TokenType.STRING:
-                return consume(scanner, TokenType.STRING).value
-            case TokenType.NUMBER:
-                num = consume(scanner, TokenType.NUMBER).value
-                if "." not in num and "e" not in num and "E" not in num:
-                    return int(num)
-                
-                else:
-                    return float(num)
-            case TokenType.BOOLEAN:
-                return consume(scanner, TokenType.BOOLEAN).value
-            case TokenType.NULL:
-                return consume(scanner, TokenType.NULL).value
+                self.open([])
+                self.state = FIRST_ELEMENT
+                return False
+            case TokenType.RBRACKET if state == FIRST_ELEMENT:
+                return self.close()
+            case TokenType.RBRACKET if state == NEXT_ELEMENT:
+                return self.error(token, "Unexpected trailing comma")
             case _:
-                return error(token, f"Unexpected input at line {scanner.line}.")
-            
-    result = parse_value(scanner)
+                return self.error(token, f"Unexpected input at line {self.scanner.line}.")
 
-    if scanner.current_position < len(scanner.tokens) - 1: #check for extra tokens after main object/array closed
-        extra_token = scanner.tokens[scanner.current_position]
-        raise Exception(f"Invalid JSON: Extra value after close at line {scanner.line}, token type: {extra_token.token_type}.")
-    
-    if isinstance(result, str) and result.startswith("Invalid JSON"):
-        return result
-            
-    return result
+    def open(self, container: JSONObject | JSONArray):
+        self.scanner.increase_depth()
+        self.stack.append(container)
+        self.keys.append(self.key)
 
+    def close(self) -> bool:
+        self.scanner.decrease_depth()
+        container = self.stack.pop()
+        self.key = self.keys.pop()
+        return self.add_value(container)
 
+    def add_value(self, value: JSONValue) -> bool:
+        stack = self.stack
+        if not stack:
+            self.result = value
+            self.state = DONE
+            return True
+        container = stack[-1]
+        if container.__class__ is list:
+            container.append(value)
+        else:
+            container[self.key] = value
+        self.state = AFTER_VALUE
+        return False
 
+    def error(self, token: Token, message: str) -> None:
+        scanner = self.scanner
+        if token is None or token.token_type == TokenType.EOF:
+            raise Exception(f"Invalid JSON: Unexpected end of input at line {scanner.line}.")
+        raise Exception(f"Invalid JSON: {message} at line {scanner.line} and index {scanner.token_index}, token type: {token.token_type}.")
@@ -0,0 +1,172 @@
+from collections.abc import Mapping, Sequence
+from typing import Dict, List, Tuple
+from .json_parser import JSONValue, decode_input
+from .extract import Extractor
+from .scanner import TokenType, MAX_DEPTH
+
+Span = Tuple[int, int] # (position, line) where a child value starts
+
+UNBUILT = object()
+
+
+def parse_lazy(json_string: str | bytes, max_depth: int = MAX_DEPTH) -> 'LazyObject | LazyArray':
+    # Returns a read-only view of the document. One skip pass up front checks that brackets
+    # balance, strings are terminated and the depth limit holds; after that a container
+    # only records where its children start when it is first read, and a child is only
+    # built when it is accessed. Other syntax errors surface on the access that reaches them.
+    json_string = decode_input(json_string)
+    parser = LazyParser(json_string, max_depth)
+    parser.check_start()
+    parser.skip_value()
+
+    parser.skip_whitespace()
+    if not parser.is_at_end(): #check for extra values after main object/array closed
+        extra_token = parser.next_token()
+        raise Exception(f"Invalid JSON: Extra value after close at line {parser.line}, token type: {extra_token.token_type}.")
+    return parser.value_at(0, 1, 0)
+
+
+class LazyParser(Extractor):
+    # Shared by every view of one document; each access moves it to the span it needs.
+    # Views of the same document are therefore not safe to read from several threads.
+
+    def value_at(self, position: int, line: int, depth: int) -> JSONValue:
+        char = self.json_string[position]
+        if char == '{':
+            return LazyObject(self, position, line, depth)
+        if char == '[':
+            return LazyArray(self, position, line, depth)
+        self.current_position, self.line, self.current_depth = position, line, depth
+        return self.parse_value()
+
+    def object_spans(self, position: int, line: int, depth: int) -> Dict[str, Span]:
+        self.current_position, self.line, self.current_depth = position, line, depth
+        self.increase_depth()
+        self.current_position += 1 # consume '{'
+        spans = {}
+        self.skip_whitespace()
+        if self.peek() == '}':
+            return spans
+        while True:
+            if self.peek() != '"':
+                return self.error(f"Expected {TokenType.STRING}")
+            self.current_position += 1
+            key = self.scan_string()
+            self.skip_whitespace()
+            if self.peek() != ':':
+                return self.error(f"Expected {TokenType.COLON}")
+            self.current_position += 1
+            self.skip_whitespace()
+            spans[key] = (self.current_position, self.line)
+            self.skip_value()
+
+            self.skip_whitespace()
+            char = self.peek()
+            if char == ',':
+                self.current_position += 1
+                self.skip_whitespace()
+                if self.peek() == '}':
+                    return self.error("Unexpected trailing comma")
+            elif char == '}':
+                return spans
+            else:
+                return self.error("Expected ',' or '}', but found something else.")
+
+    def array_spans(self, position: int, line: int, depth: int) -> List[Span]:
+        self.current_position, self.line, self.current_depth = position, line, depth
+        self.increase_depth()
+        self.current_position += 1 # consume '['
+        spans = []
+        self.skip_whitespace()
+        if self.peek() == ']':
+            return spans
+        while True:
+            spans.append((self.current_position, self.line))
+            self.skip_value()
+
+            self.skip_whitespace()
+            char = self.peek()
+            if char == ',':
+                self.current_position += 1
+                self.skip_whitespace()
+                if self.peek() == ']':
+                    return self.error("Unexpected trailing comma")
+            elif char == ']':
+                return spans
+            else:
+                return self.error("Expected ',' or ']', but found something else.")
+
+
+class LazyObject(Mapping):
+    __slots__ = ('parser', 'position', 'line', 'depth', 'spans', 'values')
+
+    def __init__(self, parser: LazyParser, position: int, line: int, depth: int):
+        self.parser = parser
+        self.position = position
+        self.line = line
+        self.depth = depth # open containers around this one
+        self.spans: Dict[str, Span] | None = None
+        self.values: Dict[str, JSONValue] = {}
+
+    def members(self) -> Dict[str, Span]:
+        if self.spans is None:
+            self.spans = self.parser.object_spans(self.position, self.line, self.depth)
+        return self.spans
+
+    def __getitem__(self, key: str) -> JSONValue:
+        values = self.values
+        if key not in values:
+            position, line = self.members()[key]
+            values[key] = self.parser.value_at(position, line, self.depth + 1)
+        return values[key]
+
+    def __contains__(self, key) -> bool:
+        return key in self.members()
+
+    def __iter__(self):
+        return iter(self.members())
+
+    def __len__(self) -> int:
+        return len(self.members())
+
+    def __repr__(self) -> str:
+        return f"<LazyObject at line {self.line}>"
+
+
+class LazyArray(Sequence):
+    __slots__ = ('parser', 'position', 'line', 'depth', 'spans', 'values')
+
+    def __init__(self, parser: LazyParser, position: int, line: int, depth: int):
+        self.parser = parser
+        self.position = position
+        self.line = line
+        self.depth = depth
+        self.spans: List[Span] | None = None
+        self.values: List[JSONValue] = []
+
+    def elements(self) -> List[Span]:
+        if self.spans is None:
+            self.spans = self.parser.array_spans(self.position, self.line, self.depth)
+            self.values = [UNBUILT] * len(self.spans)
+        return self.spans
+
+    def __getitem__(self, index: int | slice) -> JSONValue:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        spans = self.elements()
+        value = self.values[index]
+        if value is UNBUILT:
+            position, line = spans[index]
+            value = self.values[index] = self.parser.value_at(position, line, self.depth + 1)
+        return value
+
+    def __len__(self) -> int:
+        return len(self.elements())
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"<LazyArray at line {self.line}>"
@@ -0,0 +1,98 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+from .json_parser import JSONValue, JSONArray, Parser, check_input
+from .file_parser import map_file
+from .scanner import MAX_DEPTH, BYTES_TYPES, UTF8_BOM
+from .structural import StructuralIndex
+
+TRAILING_STR = re.compile(r'[ \t\n\r]*')
+TRAILING_BYTES = re.compile(rb'[ \t\n\r]*')
+
+MIN_PARALLEL_SIZE = 1024 * 1024 # smaller documents are parsed in the calling process
+SLICES_PER_WORKER = 4
+
+
+def parse_parallel(json_string: str | bytes, workers: int | None = None, max_depth: int = MAX_DEPTH) -> JSONValue:
+    # Parses a document whose top level is one large array on several processes. A
+    # structural pass finds the top-level commas, workers parse the elements between them in
+    # slices and the results are joined in order. Anything else, and every invalid document,
+    # goes through the regular parser, so errors are exactly the ones parse() reports.
+    check_input(json_string)
+    workers = workers or os.cpu_count() or 1
+    parser = Parser(max_depth)
+    ranges = split_array(json_string, workers) if workers > 1 and len(json_string) >= MIN_PARALLEL_SIZE else None
+    if ranges is None:
+        return parser.parse(json_string)
+
+    slices = [bytes(json_string[start:end]) if isinstance(json_string, BYTES_TYPES) else json_string[start:end] for start, end in ranges]
+    with ProcessPoolExecutor(workers) as executor:
+        result = join(executor.map(parse_slice, slices, [max_depth] * len(slices)))
+    return parser.parse(json_string) if result is None else result
+
+
+def parse_file_parallel(path: str | os.PathLike, workers: int | None = None, max_depth: int = MAX_DEPTH) -> JSONValue:
+    # parse_parallel for a file: the structural pass runs over a memory map, and each worker
+    # maps the file itself and reads only its own slice
+    workers = workers or os.cpu_count() or 1
+    with open(path, 'rb') as file:
+        mapped = map_file(file)
+        try:
+            parser = Parser(max_depth)
+            ranges = split_array(mapped, workers) if workers > 1 and len(mapped) >= MIN_PARALLEL_SIZE else None
+            if ranges is None:
+                return parser.parse(mapped)
+
+            starts, ends = zip(*ranges)
+            with ProcessPoolExecutor(workers) as executor:
+                result = join(executor.map(parse_file_slice, [path] * len(ranges), starts, ends, [max_depth] * len(ranges)))
+            return parser.parse(mapped) if result is None else result
+        finally:
+            mapped.close()
+
+
+def split_array(data: str | bytes, workers: int) -> List[Tuple[int, int]] | None:
+    # Cuts the inside of a top-level array at commas into about SLICES_PER_WORKER slices per
+    # worker. Returns None when the document is not a top-level array or its structure is
+    # already known to be broken. Every slice is checked again by a worker.
+    is_text = isinstance(data, str)
+    index = StructuralIndex(data)
+    ranges = index.split(workers * SLICES_PER_WORKER)
+    if ranges is None or index.offsets[0] != (0 if is_text or data[:3] != UTF8_BOM else 3):
+        return None
+    if (TRAILING_STR if is_text else TRAILING_BYTES).match(data, ranges[-1][1] + 1).end() != len(data):
+        return None # extra value after close
+    return ranges
+
+
+def join(parts) -> JSONArray | None:
+    # Concatenates the elements parsed by the workers, or None if any slice was invalid
+    result = []
+    for part in parts:
+        if part is None:
+            return None
+        result.extend(part)
+    return result
+
+
+def parse_slice(json_slice: str | bytes, max_depth: int) -> JSONArray | None:
+    # Runs in a worker process. Returns None instead of raising, so the error can be
+    # reported with the line numbers and token indices of the whole document.
+    if not json_slice.strip():
+        return None # '[,' or ',]', or an empty array that was not worth splitting
+    wrapped = '[' + json_slice + ']' if isinstance(json_slice, str) else b'[' + json_slice + b']'
+    try:
+        return Parser(max_depth).parse(wrapped)
+    except Exception:
+        return None
+
+
+def parse_file_slice(path: str | os.PathLike, start: int, end: int, max_depth: int) -> JSONArray | None:
+    with open(path, 'rb') as file:
+        mapped = map_file(file)
+        try:
+            json_slice = mapped[start:end]
+        finally:
+            mapped.close()
+    return parse_slice(json_slice, max_depth)
@@ -0,0 +1,151 @@
+import re
+import time
+from typing import Any, Callable, Dict, Tuple
+from .json_parser import JSONValue, Parser
+from .scanner import Scanner, ByteScanner, Token, TokenType, MAX_DEPTH, KEY_CACHE_SIZE, BYTES_TYPES
+
+# One escape sequence: a backslash and the character after it (\uXXXX counts once)
+ESCAPE = re.compile(r'\\.', re.S)
+BYTE_ESCAPE = re.compile(rb'\\.', re.S)
+
+PHASES = ('tokenize', 'strings', 'numbers', 'build', 'total')
+
+
+def profile(json_string: str | bytes, max_depth: int = MAX_DEPTH, key_cache_size: int = KEY_CACHE_SIZE, parse_int: Callable[[str], Any] | None = None, parse_float: Callable[[str], Any] | None = None) -> Tuple[JSONValue, 'ParseStats']:
+    # parse() that also returns what it did, for one document
+    stats = ParseStats()
+    return ProfilingParser(stats, max_depth, key_cache_size, parse_int, parse_float).parse(json_string), stats
+
+
+class ParseStats:
+    # Counters filled in by ProfilingParser. They add up over every document parsed with the
+    # same instance, except max_depth and peak_container_size, which keep the largest seen.
+    # callback, if given, is called with the stats after each document, failed ones included,
+    # e.g. to push them to a metrics exporter. Not safe to share between threads.
+    __slots__ = ('documents', 'errors', 'timings', 'tokens', 'string_bytes', 'escapes', 'numbers', 'max_depth', 'peak_container_size', 'callback')
+
+    def __init__(self, callback: Callable[['ParseStats'], None] | None = None):
+        self.documents = 0
+        self.errors = 0
+        # seconds per phase; tokenize excludes the time spent in strings
+        self.timings: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.tokens: Dict[TokenType, int] = dict.fromkeys(TokenType, 0)
+        self.string_bytes = 0 # UTF-8 bytes between the quotes of keys and strings, escapes undecoded
+        self.escapes = 0
+        self.numbers: Dict[str, int] = {'integer': 0, 'float': 0}
+        self.max_depth = 0 # 1 for a document without nested containers
+        self.peak_container_size = 0 # most members or elements in one object or array
+        self.callback = callback
+
+    def as_dict(self) -> Dict[str, Any]:
+        # Plain str keys and numbers only, ready for json.dumps or a metrics exporter
+        return {
+            'documents': self.documents,
+            'errors': self.errors,
+            'timings': dict(self.timings),
+            'tokens': {str(token_type): count for token_type, count in self.tokens.items()},
+            'string_bytes': self.string_bytes,
+            'escapes': self.escapes,
+            'numbers': dict(self.numbers),
+            'max_depth': self.max_depth,
+            'peak_container_size': self.peak_container_size,
+        }
+
+    def __repr__(self) -> str:
+        return f"<ParseStats {self.documents} documents, {sum(self.tokens.values())} tokens>"
+
+
+class ProfilingScanner(Scanner):
+    # Times and counts what the scanner does. Kept out of Scanner so that parsing without
+    # stats doesn't pay for a single check.
+
+    def __init__(self, stats: ParseStats, *args):
+        super().__init__(*args)
+        self.stats = stats
+
+    def next_token(self) -> Token:
+        begin = time.perf_counter()
+        token = super().next_token()
+        self.stats.timings['tokenize'] += time.perf_counter() - begin
+        self.stats.tokens[token.token_type] += 1
+        return token
+
+    def scan_string(self) -> str:
+        start = self.current_position # after the opening quote
+        begin = time.perf_counter()
+        value = super().scan_string()
+        elapsed = time.perf_counter() - begin
+        stats = self.stats
+        stats.timings['strings'] += elapsed
+        stats.timings['tokenize'] -= elapsed # already counted by next_token
+        self.count_string(start, self.current_position - 1)
+        return value
+
+    def count_string(self, start: int, end: int):
+        raw = self.json_string[start:end]
+        self.stats.string_bytes += len(raw) if raw.isascii() else len(raw.encode('utf-8', 'surrogatepass'))
+        if '\\' in raw:
+            self.stats.escapes += len(ESCAPE.findall(raw))
+
+    def scan_number(self) -> str:
+        value = super().scan_number()
+        self.stats.numbers['integer' if self.number_is_integer else 'float'] += 1
+        return value
+
+    def increase_depth(self):
+        super().increase_depth()
+        if self.current_depth > self.stats.max_depth:
+            self.stats.max_depth = self.current_depth
+
+
+class ProfilingByteScanner(ProfilingScanner, ByteScanner):
+
+    def count_string(self, start: int, end: int):
+        self.stats.string_bytes += end - start
+        raw = self.json_string[start:end]
+        if b'\\' in raw:
+            self.stats.escapes += len(BYTE_ESCAPE.findall(raw))
+
+
+class ProfilingParser(Parser):
+    # Parser that fills in a ParseStats as it goes. Converting numbers is timed as the
+    # numbers phase and every other step of the state machine as build.
+    __slots__ = ('stats',)
+
+    def __init__(self, stats: ParseStats, max_depth: int = MAX_DEPTH, key_cache_size: int = KEY_CACHE_SIZE, parse_int: Callable[[str], Any] | None = None, parse_float: Callable[[str], Any] | None = None):
+        super().__init__(max_depth, key_cache_size, parse_int, parse_float)
+        self.stats = stats
+
+    def parse(self, json_string: str | bytes) -> JSONValue:
+        stats = self.stats
+        begin = time.perf_counter()
+        succeeded = False
+        try:
+            result = super().parse(json_string)
+            succeeded = True
+            return result
+        finally:
+            stats.timings['total'] += time.perf_counter() - begin
+            if succeeded:
+                stats.documents += 1
+            else:
+                stats.errors += 1
+            if stats.callback is not None:
+                stats.callback(stats)
+
+    def make_scanner(self, json_string: str | bytes) -> Scanner:
+        scanner_class = ProfilingByteScanner if isinstance(json_string, BYTES_TYPES) else ProfilingScanner
+        return scanner_class(self.stats, json_string, self.max_depth, self.key_cache, self.key_cache_size, self.parse_int, self.parse_float)
+
+    def accept(self, token: Token) -> bool:
+        begin = time.perf_counter()
+        try:
+            return super().accept(token)
+        finally:
+            self.stats.timings['numbers' if token.token_type == TokenType.NUMBER else 'build'] += time.perf_counter() - begin
+
+    def close(self) -> bool:
+        size = len(self.stack[-1])
+        if size > self.stats.peak_container_size:
+            self.stats.peak_container_size = size
+        return super().close()
@@ -1,5 +1,47 @@
+import mmap
+import re
+from array import array
 from enum import StrEnum, auto
-from typing import Any, List
+from typing import Any, Callable, Iterator
+
+# Fast paths: a run of plain string characters and a complete, well-formed number literal
+STRING_CHUNK = re.compile(r'[^"\\\x00-\x1f]*')
+NUMBER = re.compile(r'-?(?:0|[1-9][0-9]*)(\.[0-9]+)?([eE][-+]?[0-9]+)?') # no group matched: an integer
+NUMBER_CONTINUATION = frozenset('0123456789.eE')
+DIGITS = frozenset('0123456789') # str.isdigit() would also let through digits of other scripts
+NUMBER_START = DIGITS | {'-'}
+HEX_DIGITS = frozenset('0123456789abcdefABCDEF')
+# The raw text of a string up to its closing quote, escapes left undecoded
+RAW_STRING = re.compile(r'(?:[^"\\\x00-\x1f]++|\\.)*+(?=")')
+KEY_SEPARATOR = re.compile(r'[ \t\n\r]*:')
+# An escape inside a string that has already been validated
+ESCAPE = re.compile(r'\\(?:u([0-9a-fA-F]{4})|(.))', re.DOTALL)
+
+# The same fast paths for UTF-8 input scanned as bytes
+BYTE_STRING_CHUNK = re.compile(rb'[^"\\\x00-\x1f]*')
+BYTE_NUMBER = re.compile(NUMBER.pattern.encode())
+BYTE_NUMBER_CONTINUATION = frozenset(b'0123456789.eE')
+BYTE_RAW_STRING = re.compile(RAW_STRING.pattern.encode())
+BYTE_KEY_SEPARATOR = re.compile(KEY_SEPARATOR.pattern.encode())
+UTF8_BOM = b'\xef\xbb\xbf'
+BYTES_TYPES = (bytes, bytearray, memoryview, mmap.mmap)
+
+KEYWORDS = {"true": True, "false": False, "null": None}
+MAX_DEPTH = 20
+KEY_CACHE_SIZE = 4096 # distinct object keys remembered per parser
+# Every integer literal of up to three characters, looked up instead of converted
+SMALL_INTS = {str(i): i for i in range(-99, 1000)} | {'-0': 0}
+
+ESCAPE_MAP = {
+    '"': '"',
+    '\\': '\\',
+    '/': '/',
+    'b': '\b',
+    'f': '\f',
+    'n': '\n',
+    'r': '\r',
+    't': '\t'
+}
 
 class TokenType(StrEnum): 
     STRING = auto()
@@ -14,7 +56,20 @@ class TokenType(StrEnum):
     COLON = auto()
     EOF = auto()
 
+TOKEN_TYPES = list(TokenType)
+TYPE_CODES = {token_type: code for code, token_type in enumerate(TOKEN_TYPES)}
+PUNCTUATION = {
+    '{': TokenType.LBRACE,
+    '}': TokenType.RBRACE,
+    '[': TokenType.LBRACKET,
+    ']': TokenType.RBRACKET,
+    ':': TokenType.COLON,
+    ',': TokenType.COMMA
+}
+
 class Token:
+    __slots__ = ('token_type', 'value')
+
     def __init__(self, token_type: TokenType, value: Any):
         self.token_type = token_type
         self.value = value
@@ -25,179 +80,388 @@ class Token:
     def __repr__(self):
         return self.__str__()
 
+class TokenBuffer:
+    # Compact token store: one type code and a source span per token, held in parallel arrays.
+    # Values are only sliced out of the source (and strings decoded) when a token is read.
+    __slots__ = ('source', 'types', 'starts', 'ends')
+
+    def __init__(self, source: str):
+        self.source = source
+        self.types = array('B')
+        self.starts = array('l')
+        self.ends = array('l')
+
+    def append(self, token_type: TokenType, start: int, end: int):
+        self.types.append(TYPE_CODES[token_type])
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def __getitem__(self, index: int) -> 'TokenView':
+        if index < 0:
+            index += len(self.types)
+        if not 0 <= index < len(self.types):
+            raise IndexError("token index out of range")
+        return TokenView(self, index)
+
+    def __iter__(self) -> Iterator['TokenView']:
+        for index in range(len(self.types)):
+            yield TokenView(self, index)
+
+    def token_type(self, index: int) -> TokenType:
+        return TOKEN_TYPES[self.types[index]]
+
+    def value(self, index: int) -> Any:
+        token_type = TOKEN_TYPES[self.types[index]]
+        if token_type == TokenType.EOF:
+            return None
+        text = self.source[self.starts[index]:self.ends[index]]
+        if not isinstance(text, str):
+            text = str(text, 'utf-8')
+        match token_type:
+            case TokenType.STRING:
+                return decode_escapes(text[1:-1]) # strip the quotes
+            case TokenType.BOOLEAN | TokenType.NULL:
+                return KEYWORDS[text]
+            case _:
+                return text
+
+class TokenView:
+    # Thin read-only view of one token in a TokenBuffer, with the same attributes as Token
+    __slots__ = ('buffer', 'index')
+
+    def __init__(self, buffer: TokenBuffer, index: int):
+        self.buffer = buffer
+        self.index = index
+
+    @property
+    def token_type(self) -> TokenType:
+        return self.buffer.token_type(self.index)
+
+    @property
+    def value(self) -> Any:
+        return self.buffer.value(self.index)
+
+    def __str__(self):
+        return f"{self.token_type}: {self.value}"
+
+    def __repr__(self):
+        return self.__str__()
+
+def decode_escapes(raw: str) -> str:
+    # The span was validated when it was scanned, so decoding cannot fail here
+    if '\\' not in raw:
+        return raw
+    return ESCAPE.sub(lambda match: chr(int(match[1], 16)) if match[1] else ESCAPE_MAP[match[2]], raw)
+
+def make_scanner(source: str | bytes, max_depth: int = MAX_DEPTH, key_cache: dict | None = None, key_cache_size: int = KEY_CACHE_SIZE, parse_int: Callable[[str], Any] | None = None, parse_float: Callable[[str], Any] | None = None) -> 'Scanner':
+    if isinstance(source, BYTES_TYPES):
+        return ByteScanner(source, max_depth, key_cache, key_cache_size, parse_int, parse_float)
+    return Scanner(source, max_depth, key_cache, key_cache_size, parse_int, parse_float)
+
 class Scanner:
-    def __init__(self, json_string: str):
+    def __init__(self, json_string: str, max_depth: int = MAX_DEPTH, key_cache: dict | None = None, key_cache_size: int = KEY_CACHE_SIZE, parse_int: Callable[[str], Any] | None = None, parse_float: Callable[[str], Any] | None = None):
         self.json_string = json_string
         self.start = 0
         self.current_position = 0
-        self.tokens: List[Token] = []
+        self.token_buffer: TokenBuffer | None = None
         self.line = 1
         self.current_depth = 0
-       
+        self.max_depth = max_depth
+        # raw source text of object keys -> decoded key, shared by every document a parser reads
+        self.key_cache = key_cache
+        self.key_cache_size = key_cache_size
+        # number conversion: hooks called with the literal's text, like json.loads takes them
+        self.parse_int = parse_int
+        self.parse_float = parse_float
+        self.number_is_integer = True # whether the last number scanned had no fraction or exponent
+        # streaming mode: the token the parser is looking at and its index in the stream
+        self.current_token: Token | None = None
+        self.token_index = -1
+
+
+    @property
+    def tokens(self) -> TokenBuffer:
+        # allocated on first use: parsing streams its tokens and never needs a buffer
+        if self.token_buffer is None:
+            self.token_buffer = TokenBuffer(self.json_string)
+        return self.token_buffer
 
     def increase_depth(self):
-        MAX_DEPTH = 20
         self.current_depth += 1
-        if self.current_depth >= MAX_DEPTH:
-            raise Exception(f"Maximum depth exceeded. Maximum depth is 20. Current depth is at {self.current_depth} at line {self.line} and index {self.current_position}, token type: {self.tokens[self.current_position].token_type}")
+        if self.current_depth >= self.max_depth:
+            raise Exception(f"Maximum depth exceeded. Maximum depth is {self.max_depth}. Current depth is at {self.current_depth} at line {self.line} and index {self.token_index}, token type: {self.current_token.token_type}")
 
     def decrease_depth(self):
         self.current_depth -= 1
         if self.current_depth < 0:
             raise Exception("Invalid JSON: Depth cannot be negative.")
         
-    def scan_tokens(self) -> list[Token]:
+    def scan_tokens(self) -> TokenBuffer:
+        # only spans are recorded: no Token object and no decoded value per token
+        tokens = self.token_buffer = TokenBuffer(self.json_string)
+        self.check_start()
+        while True:
+            token_type = self.next_token_type()
+            tokens.append(token_type, self.start, self.current_position)
+            if token_type == TokenType.EOF:
+                break
+        self.current_position = 0
+        return tokens
+
+    def iter_tokens(self) -> Iterator[Token]:
+        self.check_start()
+        while True:
+            token = self.next_token()
+            yield token
+            if token.token_type == TokenType.EOF:
+                return
+
+    def check_start(self):
         # Check that the string starts with a object or array
         if not self.is_at_end(): 
             first_char = self.json_string[0]
             if first_char != '{' and first_char != '[':
                 raise Exception("Invalid JSON: JSON must start with an object or array.")
-            
+
+    def next_token(self) -> Token:
         while not self.is_at_end():
             self.start = self.current_position
-            self.scan_token()
-        self.tokens.append(Token(TokenType.EOF, None))
-        self.current_position = 0
-        return self.tokens
+            token = self.scan_token()
+            if token is not None:
+                return token
+        self.start = self.current_position
+        return Token(TokenType.EOF, None)
+
+    def next_token_type(self) -> TokenType:
+        while not self.is_at_end():
+            self.start = self.current_position
+            token_type = self.skip_token()
+            if token_type is not None:
+                return token_type
+        self.start = self.current_position
+        return TokenType.EOF
+
+    def advance_token(self) -> Token:
+        # Pull the next token for the parser, keeping only a single token of lookahead in memory
+        if self.current_token is None:
+            self.check_start()
+        elif self.current_token.token_type == TokenType.EOF:
+            return self.current_token
+        self.current_token = self.next_token()
+        self.token_index += 1
+        return self.current_token
 
     def is_at_end(self) -> bool:
         return self.current_position >= len(self.json_string)
     
-    def scan_token(self):
+    def scan_token(self) -> Token | None:
         char = self.advance()
         match char:
             case '{':
-                self.tokens.append(Token(TokenType.LBRACE, char))
+                return Token(TokenType.LBRACE, char)
             case '}':
-                self.tokens.append(Token(TokenType.RBRACE, char))
+                return Token(TokenType.RBRACE, char)
             case '[':
-                self.tokens.append(Token(TokenType.LBRACKET, char))
+                return Token(TokenType.LBRACKET, char)
             case ']':
-                self.tokens.append(Token(TokenType.RBRACKET, char))
+                return Token(TokenType.RBRACKET, char)
             case ':':
-                self.tokens.append(Token(TokenType.COLON, char))
+                return Token(TokenType.COLON, char)
             case ' ' | '\r' | '\t':
                 pass
             case '\n':
                 self.line += 1
             case '"':
-                self.add_string()
+                return self.add_string()
             case ',':
-                self.tokens.append(Token(TokenType.COMMA, char))
+                return Token(TokenType.COMMA, char)
             case ' ':
                 pass
             case _:
-                if char.isdigit() or char == '-':
-                    self.add_number()
+                if char in NUMBER_START:
+                    return self.add_number()
                 elif char.isalpha():
-                    self.add_keyword()
+                    return self.add_keyword()
+                else:
+                    raise Exception(f"Unexpected character: {char} at line {self.line}.")
+
+
+    def skip_token(self) -> TokenType | None:
+        # Same rules as scan_token, but the token is only validated and classified
+        char = self.advance()
+        token_type = PUNCTUATION.get(char)
+        if token_type is not None:
+            return token_type
+        match char:
+            case ' ' | '\r' | '\t':
+                return None
+            case '\n':
+                self.line += 1
+                return None
+            case '"':
+                self.skip_string()
+                return TokenType.STRING
+            case _:
+                if char in NUMBER_START:
+                    self.scan_number()
+                    return TokenType.NUMBER
+                elif char.isalpha():
+                    return TokenType.NULL if self.scan_keyword() == "null" else TokenType.BOOLEAN
                 else:
                     raise Exception(f"Unexpected character: {char} at line {self.line}.")
 
-             
     def advance(self) -> str:
         char = self.json_string[self.current_position]
         self.current_position += 1
         return char
+
+    def previous_character(self) -> str:
+        return self.json_string[self.current_position - 1]
+
+    def text(self, start: int, end: int) -> str:
+        return self.json_string[start:end]
     
-    def add_string(self):
-        value = []
-        while not self.is_at_end() and self.peek() != '"':
-            if self.peek() == '\\':
-                self.advance()
-                if self.is_at_end():
-                    raise Exception("Invalid JSON: Unexpected end of input in string.")
-                escape_char = self.advance()
-                if escape_char not in ('"', '\\', '/', 'b', 'f', 'n', 'r', 't', 'u'):
-                    raise Exception(f"Invalid JSON: Illegal backslash escape {escape_char} at line {self.line}.")
-                if escape_char == 'u':
-                    hex_digits = ""
-                    for _ in range(4):
-                        if self.is_at_end() or not self.peek().isalnum():
-                            raise Exception("Invalid JSON: Invalid unicode escape sequence.")
-                        hex_digits += self.advance()
-                    try:
-                        value.append(chr(int(hex_digits, 16)))
-                    except ValueError:
-                        raise Exception("Invalid JSON: Invalid unicode escape sequence.")
-                else:
-                    escape_map = {
-                        '"': '"',
-                        '\\': '\\',
-                        '/': '/',
-                        'b': '\b',
-                        'f': '\f',
-                        'n': '\n',
-                        'r': '\r',
-                        't': '\t'
-                    }
-                    value.append(escape_map[escape_char])
-            else:
-                char = self.advance()
+    def add_string(self) -> Token:
+        return Token(TokenType.STRING, self.scan_string())
 
-                if ord(char) < 0x20:
-                    raise Exception(f"Invalid JSON: Control character {repr(char)} at line {self.line}.")
-                
-                value.append(char)
+    def scan_string(self) -> str:
+        if self.key_cache is None:
+            return self.decode_string()
+        match = RAW_STRING.match(self.json_string, self.current_position)
+        if match is None:
+            return self.decode_string() # let the decoder report what is wrong
 
+        # repeated keys are looked up by their raw text: they share one string object and
+        # their escapes are only decoded the first time
+        end = match.end()
+        raw = self.json_string[self.current_position:end]
+        value = self.key_cache.get(raw)
+        if value is None:
+            value = self.decode_string() if '\\' in raw else raw
+            if len(self.key_cache) < self.key_cache_size and KEY_SEPARATOR.match(self.json_string, end + 1):
+                self.key_cache[raw] = value
+        self.current_position = end + 1 # consume closing quote
+        return value
 
+    def skip_string(self):
+        match = RAW_STRING.match(self.json_string, self.current_position)
+        if match is None or '\\' in match.group():
+            self.decode_string() # escapes are checked, and errors reported, by the decoder
+        else:
+            self.current_position = match.end() + 1 # consume closing quote
+
+    def decode_string(self) -> str:
+        value = []
+        while True:
+            # copy whole runs of plain characters with a single slice
+            end = STRING_CHUNK.match(self.json_string, self.current_position).end()
+            if end != self.current_position:
+                value.append(self.json_string[self.current_position:end])
+                self.current_position = end
+
+            if self.is_at_end():
+                raise Exception("Invalid JSON: Unexpected end of input in string.")
+            char = self.advance()
+            if char == '"':
+                return ''.join(value)
+            if char == '\\':
+                value.append(self.read_escape())
+            else:
+                raise Exception(f"Invalid JSON: Control character {repr(char)} at line {self.line}.")
+
+    def read_escape(self) -> str:
         if self.is_at_end():
             raise Exception("Invalid JSON: Unexpected end of input in string.")
-            
-        self.advance() # consume closing quote
-        self.tokens.append(Token(TokenType.STRING, ''.join(value)))
-     
-    def add_number(self):
+        escape_char = self.advance()
+        if escape_char not in ('"', '\\', '/', 'b', 'f', 'n', 'r', 't', 'u'):
+            raise Exception(f"Invalid JSON: Illegal backslash escape {escape_char} at line {self.line}.")
+        if escape_char == 'u':
+            hex_digits = ""
+            for _ in range(4):
+                if self.is_at_end() or self.peek() not in HEX_DIGITS:
+                    raise Exception("Invalid JSON: Invalid unicode escape sequence.")
+                hex_digits += self.advance()
+            try:
+                return chr(int(hex_digits, 16))
+            except ValueError:
+                raise Exception("Invalid JSON: Invalid unicode escape sequence.")
+        return ESCAPE_MAP[escape_char]
+
+    def add_number(self) -> Token:
+        return Token(TokenType.NUMBER, self.scan_number())
+
+    def scan_number(self) -> str:
+        # fast path: the whole literal in one match, unless it is followed by something that makes it malformed
+        match = NUMBER.match(self.json_string, self.current_position - 1)
+        if match is not None:
+            end = match.end()
+            if end >= len(self.json_string) or self.json_string[end] not in NUMBER_CONTINUATION:
+                self.current_position = end
+                self.number_is_integer = match.lastindex is None
+                return match.group()
+        return self.scan_number_by_character()
+
+    def scan_number_by_character(self) -> str:
+        # slow path, character by character, to report exactly what is wrong with the literal
         value = []
-        value.append(self.json_string[self.current_position - 1]) # starting with the first digit
+        value.append(self.previous_character()) # starting with the first digit
+        self.number_is_integer = True
 
         # negative sign
         if value[0] == '-':
-            if self.is_at_end() or not self.peek().isdigit():
+            if self.is_at_end() or not self.peek() in DIGITS:
                 raise Exception(f"Invalid JSON: Unexpected character after '-' at line {self.line}.")
             value.append(self.advance())
 
         # leading zero check
         if value[-1] == '0':
-            if not self.is_at_end() and self.peek().isdigit():
+            if not self.is_at_end() and self.peek() in DIGITS:
                 raise Exception(f"Invalid JSON: Leading zeros in number at line {self.line}.")
 
         # integer part
-        while not self.is_at_end() and self.peek().isdigit():
+        while not self.is_at_end() and self.peek() in DIGITS:
                 value.append(self.advance())
         
         # decimal part
         if not self.is_at_end() and self.peek() == '.':
+            self.number_is_integer = False
             value.append(self.advance())
-            if self.is_at_end() or not self.peek().isdigit():
+            if self.is_at_end() or not self.peek() in DIGITS:
                 raise Exception(f"Invalid JSON: Unexpected character after '.' at line {self.line}.")
-            while not self.is_at_end() and self.peek().isdigit():
+            while not self.is_at_end() and self.peek() in DIGITS:
                 value.append(self.advance())
 
         # exponent part
         if not self.is_at_end() and self.peek() in ('e', 'E'):
+            self.number_is_integer = False
             value.append(self.advance())
             if not self.is_at_end() and self.peek() in ('+', '-'):
                 value.append(self.advance())
-            if self.is_at_end() or not self.peek().isdigit():
+            if self.is_at_end() or not self.peek() in DIGITS:
                 raise Exception(f"Invalid JSON: Unexpected character after exponent at line {self.line}.")
-            while not self.is_at_end() and self.peek().isdigit():
+            while not self.is_at_end() and self.peek() in DIGITS:
                 value.append(self.advance())
 
-        self.tokens.append(Token(TokenType.NUMBER, ''.join(value)))
+        return ''.join(value)
        
     
-    def add_keyword(self):
+    def add_keyword(self) -> Token:
+        value = self.scan_keyword()
+        token_type = TokenType.BOOLEAN if value in ("true", "false") else TokenType.NULL
+        return Token(token_type, KEYWORDS[value])
+
+    def scan_keyword(self) -> str:
         # Get the keyword
-        value = self.json_string[self.current_position - 1] # start with the first character
+        value = self.previous_character() # start with the first character
         while not self.is_at_end() and self.peek().isalnum():
             value += self.advance()
 
         # Check if it is valid
-        keywords = {"true": True, "false": False, "null": None}    
-        if value in keywords:
-            token_type = TokenType.BOOLEAN if value in ("true", "false") else TokenType.NULL
-            self.tokens.append(Token(token_type, keywords[value]))
+        if value in KEYWORDS:
+            return value
         else:
             raise Exception(f"Unexpected keyword: {value} at line {self.line}. Keywords must be 'true', 'false', or 'null'.")
         
@@ -206,3 +470,107 @@ class Scanner:
         if self.is_at_end():
             return "\0" # return null character
         return self.json_string[self.current_position]
+
+
+class ByteScanner(Scanner):
+    # Scans UTF-8 encoded bytes, bytearray, memoryview or mmap input in place: structure is matched on
+    # the raw bytes and only string values are decoded, one slice at a time.
+
+    def __init__(self, data: bytes, max_depth: int = MAX_DEPTH, key_cache: dict | None = None, key_cache_size: int = KEY_CACHE_SIZE, parse_int: Callable[[str], Any] | None = None, parse_float: Callable[[str], Any] | None = None):
+        if isinstance(data, memoryview) and data.format != 'B':
+            data = data.cast('B')
+        super().__init__(data, max_depth, key_cache, key_cache_size, parse_int, parse_float)
+        if data[:3] == UTF8_BOM:
+            self.current_position = 3
+
+    def check_start(self):
+        # Check that the document starts with a object or array, after the BOM if there is one
+        if not self.is_at_end():
+            if self.json_string[self.current_position] not in b'{[':
+                raise Exception("Invalid JSON: JSON must start with an object or array.")
+
+    def advance(self) -> str:
+        byte = self.json_string[self.current_position]
+        if byte < 0x80:
+            self.current_position += 1
+            return chr(byte)
+        char, self.current_position = self.decode_character(self.current_position)
+        return char
+
+    def peek(self) -> str:
+        if self.is_at_end():
+            return "\0" # return null character
+        byte = self.json_string[self.current_position]
+        if byte < 0x80:
+            return chr(byte)
+        return self.decode_character(self.current_position)[0]
+
+    def previous_character(self) -> str:
+        # step back over continuation bytes to the start of the last character
+        start = self.current_position - 1
+        while start > 0 and self.json_string[start] & 0xC0 == 0x80:
+            start -= 1
+        return self.text(start, self.current_position)
+
+    def decode_character(self, position: int) -> tuple[str, int]:
+        byte = self.json_string[position]
+        length = 2 if byte < 0xE0 else 3 if byte < 0xF0 else 4
+        return self.text(position, position + length), position + length
+
+    def text(self, start: int, end: int) -> str:
+        try:
+            return str(self.json_string[start:end], 'utf-8')
+        except UnicodeDecodeError:
+            raise Exception(f"Invalid JSON: Invalid UTF-8 at line {self.line}.")
+
+    def scan_string(self) -> str:
+        if self.key_cache is None:
+            return self.decode_string()
+        match = BYTE_RAW_STRING.match(self.json_string, self.current_position)
+        if match is None:
+            return self.decode_string() # let the decoder report what is wrong
+
+        # a repeated key skips UTF-8 and escape decoding altogether
+        end = match.end()
+        raw = bytes(self.json_string[self.current_position:end]) # hashable for bytearray/memoryview input
+        value = self.key_cache.get(raw)
+        if value is None:
+            value = self.decode_string() if b'\\' in raw else self.text(self.current_position, end)
+            if len(self.key_cache) < self.key_cache_size and BYTE_KEY_SEPARATOR.match(self.json_string, end + 1):
+                self.key_cache[raw] = value
+        self.current_position = end + 1 # consume closing quote
+        return value
+
+    def skip_string(self):
+        self.decode_string() # decoding is what checks the UTF-8
+
+    def decode_string(self) -> str:
+        value = []
+        data = self.json_string
+        while True:
+            # decode whole runs of plain characters with a single slice
+            end = BYTE_STRING_CHUNK.match(data, self.current_position).end()
+            if end != self.current_position:
+                value.append(self.text(self.current_position, end))
+                self.current_position = end
+
+            if self.is_at_end():
+                raise Exception("Invalid JSON: Unexpected end of input in string.")
+            char = self.advance()
+            if char == '"':
+                return ''.join(value)
+            if char == '\\':
+                value.append(self.read_escape())
+            else:
+                raise Exception(f"Invalid JSON: Control character {repr(char)} at line {self.line}.")
+
+    def scan_number(self) -> str:
+        # fast path: the whole literal in one match, unless it is followed by something that makes it malformed
+        match = BYTE_NUMBER.match(self.json_string, self.current_position - 1)
+        if match is not None:
+            end = match.end()
+            if end >= len(self.json_string) or self.json_string[end] not in BYTE_NUMBER_CONTINUATION:
+                self.current_position = end
+                self.number_is_integer = match.lastindex is None
+                return match.group().decode('ascii')
+        return self.scan_number_by_character()
@@ -0,0 +1,274 @@
+import json
+import threading
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Tuple
+from .json_parser import JSONValue, JSONObject, JSONArray, Parser
+from .scanner import MAX_DEPTH, KEY_CACHE_SIZE
+
+MAX_COMPILED = 256 # compiled schemas kept for reuse
+
+TYPES = {
+    'string': (str,),
+    'integer': (int,),
+    'number': (int, float, Decimal),
+    'boolean': (bool,),
+    'null': (type(None),),
+    'object': (dict,),
+    'array': (list,),
+}
+TYPE_NAMES = {str: 'string', int: 'integer', float: 'number', Decimal: 'number', bool: 'boolean', type(None): 'null', dict: 'object', list: 'array'}
+NUMBERS = frozenset(TYPES['number'])
+
+# Keywords that don't constrain anything; any other keyword outside the subset is an error,
+# so a schema is never silently checked less strictly than it reads
+ANNOTATIONS = frozenset({'$schema', '$id', '$comment', 'title', 'description', 'default', 'examples'})
+NUMBER_LIMITS = ('minimum', 'maximum', 'exclusiveMinimum', 'exclusiveMaximum')
+SIZE_LIMITS = ('minLength', 'maxLength', 'minItems', 'maxItems')
+
+
+def compile_schema(schema: dict) -> 'Schema | None':
+    # Compiles the supported subset of JSON Schema: type, enum, properties, required, items,
+    # minimum/maximum (and their exclusive forms), minLength/maxLength and minItems/maxItems.
+    # Equal schemas share one compiled instance. None stands for a schema without constraints.
+    try:
+        key = json.dumps(schema, sort_keys=True)
+    except (TypeError, ValueError):
+        raise Exception("Invalid schema: A schema must be a JSON object.") from None
+    with _compiled_lock:
+        if key in _compiled:
+            _compiled.move_to_end(key)
+            return _compiled[key]
+    compiled = build(schema, '$')
+    with _compiled_lock:
+        _compiled[key] = compiled
+        if len(_compiled) > MAX_COMPILED:
+            _compiled.popitem(last=False)
+    return compiled
+
+
+_compiled: OrderedDict[str, 'Schema | None'] = OrderedDict()
+_compiled_lock = threading.Lock()
+
+
+def build(schema: dict, where: str) -> 'Schema | None':
+    if not isinstance(schema, dict):
+        raise Exception(f"Invalid schema: {where} must be an object.")
+    unsupported = set(schema) - ANNOTATIONS - {'type', 'enum', 'properties', 'required', 'items', *NUMBER_LIMITS, *SIZE_LIMITS}
+    if unsupported:
+        raise Exception(f"Invalid schema: Unsupported keyword {sorted(unsupported)[0]} at {where}.")
+    if not set(schema) - ANNOTATIONS:
+        return None
+
+    compiled = Schema()
+    if 'type' in schema:
+        names = [schema['type']] if isinstance(schema['type'], str) else schema['type']
+        if not isinstance(names, list) or not names or any(name not in TYPES for name in names):
+            raise Exception(f"Invalid schema: type at {where} must be one of {', '.join(TYPES)}, or a list of them.")
+        compiled.type_names = tuple(names)
+        compiled.classes = frozenset(cls for name in names for cls in TYPES[name])
+        compiled.integer = 'integer' in names and 'number' not in names
+    if 'enum' in schema:
+        if not isinstance(schema['enum'], list):
+            raise Exception(f"Invalid schema: enum at {where} must be an array.")
+        compiled.enum = schema['enum']
+    for keyword in NUMBER_LIMITS:
+        if keyword in schema:
+            limit = schema[keyword]
+            if limit.__class__ not in NUMBERS:
+                raise Exception(f"Invalid schema: {keyword} at {where} must be a number.")
+            setattr(compiled, LIMIT_ATTRIBUTES[keyword], limit)
+    for keyword in SIZE_LIMITS:
+        if keyword in schema:
+            limit = schema[keyword]
+            if limit.__class__ is not int or limit < 0:
+                raise Exception(f"Invalid schema: {keyword} at {where} must be a non-negative integer.")
+            setattr(compiled, LIMIT_ATTRIBUTES[keyword], limit)
+    if 'required' in schema:
+        required = schema['required']
+        if not isinstance(required, list) or any(not isinstance(name, str) for name in required):
+            raise Exception(f"Invalid schema: required at {where} must be an array of strings.")
+        compiled.required = tuple(required)
+    if 'properties' in schema:
+        if not isinstance(schema['properties'], dict):
+            raise Exception(f"Invalid schema: properties at {where} must be an object.")
+        for name, child in schema['properties'].items():
+            child = build(child, f"{where}.properties.{name}")
+            if child is not None: # unconstrained members aren't looked up at all
+                compiled.properties[name] = child
+    if 'items' in schema:
+        compiled.items = build(schema['items'], f"{where}.items")
+    return compiled
+
+
+LIMIT_ATTRIBUTES = {
+    'minimum': 'minimum', 'maximum': 'maximum', 'exclusiveMinimum': 'exclusive_minimum', 'exclusiveMaximum': 'exclusive_maximum',
+    'minLength': 'min_length', 'maxLength': 'max_length', 'minItems': 'min_items', 'maxItems': 'max_items',
+}
+
+
+def type_name(value: Any) -> str:
+    return TYPE_NAMES.get(value.__class__, value.__class__.__name__)
+
+
+def is_integral(value: Any) -> bool:
+    # JSON Schema counts 1.0 as an integer
+    if value.__class__ is float:
+        return value.is_integer()
+    return value.__class__ is Decimal and value.is_finite() and value == value.to_integral_value()
+
+
+def json_equal(a: Any, b: Any) -> bool:
+    # == without true equalling 1, at any depth
+    if (a.__class__ is bool) != (b.__class__ is bool):
+        return False
+    if a.__class__ is dict:
+        return b.__class__ is dict and a.keys() == b.keys() and all(json_equal(a[key], b[key]) for key in a)
+    if a.__class__ is list:
+        return b.__class__ is list and len(a) == len(b) and all(map(json_equal, a, b))
+    return a == b
+
+
+class Schema:
+    # One compiled schema node. check() and check_end() return why a value breaks it, or None.
+    __slots__ = ('type_names', 'classes', 'integer', 'enum', 'minimum', 'maximum', 'exclusive_minimum', 'exclusive_maximum',
+                 'min_length', 'max_length', 'min_items', 'max_items', 'required', 'properties', 'items')
+
+    def __init__(self):
+        self.type_names: Tuple[str, ...] = ()
+        self.classes: frozenset | None = None # None: any type
+        self.integer = False # integral floats pass as well
+        self.enum: List[JSONValue] | None = None
+        self.minimum = self.maximum = self.exclusive_minimum = self.exclusive_maximum = None
+        self.min_length: int | None = None
+        self.max_length: int | None = None
+        self.min_items: int | None = None
+        self.max_items: int | None = None
+        self.required: Tuple[str, ...] = ()
+        self.properties: Dict[str, Schema] = {}
+        self.items: Schema | None = None
+
+    def check_type(self, value: Any) -> str | None:
+        if self.classes is None or value.__class__ in self.classes or (self.integer and is_integral(value)):
+            return None
+        return f"should be {' or '.join(self.type_names)}, not {type_name(value)}"
+
+    def check(self, value: JSONValue) -> str | None:
+        # A string, number, boolean or null
+        reason = self.check_type(value)
+        if reason is not None:
+            return reason
+        if self.enum is not None and not any(json_equal(value, option) for option in self.enum):
+            return f"should be one of {json.dumps(self.enum)}"
+        if value.__class__ is str:
+            if self.max_length is not None and len(value) > self.max_length:
+                return f"should be at most {self.max_length} characters long"
+            if self.min_length is not None and len(value) < self.min_length:
+                return f"should be at least {self.min_length} characters long"
+        elif value.__class__ in NUMBERS:
+            if self.minimum is not None and value < self.minimum:
+                return f"should be at least {self.minimum}"
+            if self.maximum is not None and value > self.maximum:
+                return f"should be at most {self.maximum}"
+            if self.exclusive_minimum is not None and value <= self.exclusive_minimum:
+                return f"should be greater than {self.exclusive_minimum}"
+            if self.exclusive_maximum is not None and value >= self.exclusive_maximum:
+                return f"should be less than {self.exclusive_maximum}"
+        return None
+
+    def check_end(self, container: JSONObject | JSONArray) -> str | None:
+        # A container that has just been closed; its type was checked when it was opened
+        if container.__class__ is dict:
+            for name in self.required:
+                if name not in container:
+                    return f"is missing required property {json.dumps(name)}"
+        elif self.min_items is not None and len(container) < self.min_items:
+            return f"should have at least {self.min_items} items"
+        if self.enum is not None and not any(json_equal(container, option) for option in self.enum):
+            return f"should be one of {json.dumps(self.enum)}"
+        return None
+
+
+def path_step(key: str) -> str:
+    if key.isidentifier():
+        return f".{key}"
+    return "['" + key.replace('\\', '\\\\').replace("'", "\\'") + "']"
+
+
+class SchemaParser(Parser):
+    # Parser that checks each value against its schema as it is added, so an invalid document
+    # fails at the first violation instead of after a second pass over the result. A
+    # container's type is checked when it opens; required, minItems and enum when it closes.
+    # Members and elements without a schema of their own cost one lookup.
+    __slots__ = ('schema', 'schemas')
+
+    def __init__(self, schema: 'dict | Schema | None', max_depth: int = MAX_DEPTH, key_cache_size: int = KEY_CACHE_SIZE, parse_int: Callable[[str], Any] | None = None, parse_float: Callable[[str], Any] | None = None):
+        super().__init__(max_depth, key_cache_size, parse_int, parse_float)
+        self.schema = schema if schema is None or isinstance(schema, Schema) else compile_schema(schema)
+
+    def reset(self):
+        super().reset()
+        self.schemas: List[Schema | None] = [] # schema of each open container
+
+    def value_schema(self) -> Schema | None:
+        # Schema of the value that starts now; also checks that its array has room for it
+        stack = self.stack
+        if not stack:
+            return self.schema
+        parent = self.schemas[-1]
+        if parent is None:
+            return None
+        container = stack[-1]
+        if container.__class__ is list:
+            if parent.max_items is not None and len(container) >= parent.max_items:
+                self.violation(f"should have at most {parent.max_items} items", self.container_path(len(stack)))
+            return parent.items
+        return parent.properties.get(self.key)
+
+    def open(self, container: JSONObject | JSONArray):
+        schema = self.value_schema()
+        if schema is not None:
+            reason = schema.check_type(container)
+            if reason is not None:
+                self.violation(reason, self.value_path())
+        super().open(container)
+        self.schemas.append(schema)
+
+    def close(self) -> bool:
+        schema = self.schemas.pop()
+        if schema is not None:
+            reason = schema.check_end(self.stack[-1])
+            if reason is not None:
+                self.violation(reason, self.container_path(len(self.stack)))
+        self.scanner.decrease_depth()
+        container = self.stack.pop()
+        self.key = self.keys.pop()
+        return Parser.add_value(self, container) # already checked
+
+    def add_value(self, value: JSONValue) -> bool:
+        if self.stack and self.schemas[-1] is None:
+            return Parser.add_value(self, value) # nothing below an unconstrained container
+        schema = self.value_schema()
+        if schema is not None:
+            reason = schema.check(value)
+            if reason is not None:
+                self.violation(reason, self.value_path())
+        return Parser.add_value(self, value)
+
+    def container_path(self, depth: int) -> str:
+        # JSONPath of the open container `depth` levels down, only built for an error message
+        path = '$'
+        for level in range(1, depth):
+            parent = self.stack[level - 1]
+            path += f"[{len(parent)}]" if parent.__class__ is list else path_step(self.keys[level])
+        return path
+
+    def value_path(self) -> str:
+        path = self.container_path(len(self.stack))
+        if not self.stack:
+            return path
+        container = self.stack[-1]
+        return path + (f"[{len(container)}]" if container.__class__ is list else path_step(self.key))
+
+    def violation(self, reason: str, path: str) -> None:
+        raise Exception(f"Schema violation: {path} {reason} at line {self.scanner.line}.")
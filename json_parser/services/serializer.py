@@ -0,0 +1,155 @@
+import math
+import re
+from collections.abc import Mapping
+from decimal import Decimal
+from typing import IO, Any, Callable, Iterator
+
+CHUNK_SIZE = 64 * 1024 # characters per chunk yielded by iterdumps
+KEY_CACHE_SIZE = 4096 # distinct keys kept quoted, with their separator, per call
+FLUSH_PARTS = 1024 # pieces of output joined at a time while streaming
+
+# Characters that can't appear raw in a JSON string. Lone surrogates (which parse() produces for
+# escaped surrogate pairs) are escaped too, so the output always encodes as UTF-8 and parses back
+# to the same string.
+NEEDS_ESCAPE = re.compile(r'["\\\x00-\x1f\ud800-\udfff]')
+ESCAPES = {'"': '\\"', '\\': '\\\\', '\b': '\\b', '\f': '\\f', '\n': '\\n', '\r': '\\r', '\t': '\\t'}
+ESCAPE_TABLE = str.maketrans({
+    **{chr(code): f'\\u{code:04x}' for code in range(0x20)},
+    **{chr(code): f'\\u{code:04x}' for code in range(0xd800, 0xe000)},
+    **ESCAPES,
+})
+
+END = object() # marks an exhausted container
+
+
+def dumps(obj: Any, sort_keys: bool = False, indent: int | None = None, default: Callable[[Any], Any] | None = None) -> str:
+    # Serializes obj to a JSON string, compact unless indent is given. Nesting depth is not
+    # limited, since the encoder keeps its own stack. default is called with any object that
+    # has no JSON form and should return one that has.
+    return ''.join(encode(obj, sort_keys, indent, default, None))
+
+
+def dump(obj: Any, fp: IO[str], sort_keys: bool = False, indent: int | None = None, default: Callable[[Any], Any] | None = None, chunk_size: int = CHUNK_SIZE):
+    # Writes obj to a text file, chunk by chunk
+    for chunk in encode(obj, sort_keys, indent, default, chunk_size):
+        fp.write(chunk)
+
+
+def iterdumps(obj: Any, sort_keys: bool = False, indent: int | None = None, default: Callable[[Any], Any] | None = None, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    # Yields the JSON text in chunks of about chunk_size characters, e.g. for a
+    # StreamingHttpResponse. Only the chunk being built is held in memory.
+    return encode(obj, sort_keys, indent, default, chunk_size)
+
+
+def quote(string: str) -> str:
+    if NEEDS_ESCAPE.search(string) is None:
+        return '"' + string + '"'
+    return '"' + string.translate(ESCAPE_TABLE) + '"'
+
+
+def encode(obj: Any, sort_keys: bool, indent: int | None, default: Callable[[Any], Any] | None, chunk_size: int | None) -> Iterator[str]:
+    parts: list[str] = []
+    append = parts.append
+    pending: list[str] = [] # joined parts not yet yielded, when streaming
+    pending_size = 0
+
+    key_separator = ':' if indent is None else ': '
+    quoted_keys: dict[str, str] = {}
+    newlines = ['\n'] # newline and indentation before an item, by depth
+    stack: list[tuple[Iterator, bool, int]] = [] # (items, is_object, id) of each open container
+    open_ids: set[int] = set() # containers being written, to catch circular references
+    value = obj
+    while True:
+        first = False # the next item is the first of a container just opened
+        cls = value.__class__
+        if cls is str:
+            append(quote(value))
+        elif value is None:
+            append('null')
+        elif value is True:
+            append('true')
+        elif value is False:
+            append('false')
+        elif cls is int:
+            append(int.__repr__(value))
+        elif cls is float:
+            if not math.isfinite(value):
+                raise Exception(f"Cannot serialize {value!r}: out of range numbers are not valid JSON.")
+            append(float.__repr__(value))
+        elif cls is dict or cls is list or isinstance(value, (Mapping, list, tuple)):
+            is_object = cls is dict or (cls is not list and isinstance(value, Mapping))
+            if not value:
+                append('{}' if is_object else '[]')
+            else:
+                if id(value) in open_ids:
+                    raise Exception("Cannot serialize a circular reference.")
+                open_ids.add(id(value))
+                if is_object:
+                    stack.append((iter(sorted(value.items()) if sort_keys else value.items()), True, id(value)))
+                    append('{')
+                else:
+                    stack.append((iter(value), False, id(value)))
+                    append('[')
+                if indent is not None and len(newlines) <= len(stack):
+                    newlines.append('\n' + ' ' * (indent * len(stack)))
+                first = True
+        elif isinstance(value, str):
+            append(quote(str.__str__(value)))
+        elif isinstance(value, int):
+            append(int.__repr__(value))
+        elif isinstance(value, float):
+            value = float(value)
+            continue
+        elif cls is Decimal:
+            if not value.is_finite():
+                raise Exception(f"Cannot serialize {value!r}: out of range numbers are not valid JSON.")
+            append(str(value))
+        elif default is not None:
+            value = default(value)
+            continue
+        else:
+            raise Exception(f"Cannot serialize an object of type {cls.__name__}.")
+
+        # move on to the next member or element of the innermost unfinished container
+        while stack:
+            items, is_object, container_id = stack[-1]
+            item = next(items, END)
+            if item is END:
+                stack.pop()
+                open_ids.discard(container_id)
+                closing = '}' if is_object else ']'
+                append(closing if indent is None else newlines[len(stack)] + closing)
+                first = False
+                continue
+            if indent is None:
+                if not first:
+                    append(',')
+            else:
+                append(newlines[len(stack)] if first else ',' + newlines[len(stack)])
+            if is_object:
+                key, value = item
+                quoted = quoted_keys.get(key)
+                if quoted is None:
+                    if not isinstance(key, str):
+                        raise Exception(f"Cannot serialize a key of type {key.__class__.__name__}; keys must be strings.")
+                    quoted = quote(key) + key_separator
+                    if len(quoted_keys) < KEY_CACHE_SIZE:
+                        quoted_keys[key] = quoted
+                append(quoted)
+            else:
+                value = item
+            break
+        else:
+            break
+
+        if chunk_size is not None and len(parts) >= FLUSH_PARTS:
+            pending.append(''.join(parts))
+            pending_size += len(pending[-1])
+            parts.clear()
+            if pending_size >= chunk_size:
+                yield ''.join(pending)
+                pending.clear()
+                pending_size = 0
+
+    pending.append(''.join(parts))
+    yield ''.join(pending)
@@ -0,0 +1,177 @@
+import re
+from array import array
+from typing import Iterator, List, Tuple
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# A structural character, or a whole string. The closing quote is captured so an
+# unterminated string can be told apart; control characters are left for the parser.
+STRUCTURAL = r'[\[\]{}:,]|"(?:[^"\\]++|\\.)*+(")?'
+STRUCTURAL_STR = re.compile(STRUCTURAL, re.DOTALL)
+STRUCTURAL_BYTES = re.compile(STRUCTURAL.encode(), re.DOTALL)
+
+LBRACE, RBRACE, LBRACKET, RBRACKET, COLON, COMMA, QUOTE, BACKSLASH = b'{}[]:,"\\'
+OPENERS = (LBRACE, LBRACKET)
+CLOSERS = (RBRACE, RBRACKET)
+
+BLOCK_SIZE = 1 << 20 # bytes the NumPy builder classifies at a time
+if numpy is not None:
+    STRUCTURAL_CHARACTERS = numpy.zeros(256, dtype=bool)
+    STRUCTURAL_CHARACTERS[list(b'{}[]:,')] = True
+
+
+class StructuralIndex:
+    # Positions of every structural character outside strings ({ } [ ] : ,) and of the
+    # opening quote of every string, found in one pass over the document. Entries are
+    # numbered in document order; kinds holds the character of each entry. Brackets are
+    # paired up on first use, so values can be skipped or split without rescanning.
+    __slots__ = ('data', 'offsets', 'kinds', 'complete', 'pairs')
+
+    def __init__(self, data: str | bytes, use_numpy: bool | None = None):
+        self.data = data
+        if use_numpy is None:
+            use_numpy = numpy is not None and (not isinstance(data, str) or data.isascii())
+        self.offsets, self.kinds, self.complete = build_with_numpy(data) if use_numpy else build_with_regex(data)
+        self.pairs: array | None = None
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def pair(self, entry: int) -> int:
+        # Entry of the bracket matching the one at entry, or -1 if it is unbalanced
+        if self.pairs is None:
+            self.pairs = pair_brackets(self.kinds)
+        return self.pairs[entry]
+
+    def skip(self, entry: int) -> int:
+        # First entry after the string or container that starts at entry
+        if self.kinds[entry] in OPENERS:
+            return self.pair(entry) + 1
+        return entry + 1
+
+    def commas(self, entry: int) -> Iterator[int]:
+        # Entries of the commas directly inside the container that starts at entry
+        kinds = self.kinds
+        end = self.pair(entry)
+        current = entry + 1
+        while current < end:
+            kind = kinds[current]
+            if kind == COMMA:
+                yield current
+            elif kind in OPENERS:
+                current = self.pairs[current]
+            current += 1
+
+    def split(self, pieces: int) -> List[Tuple[int, int]] | None:
+        # Cuts the inside of a top-level array into about `pieces` (start, end) text ranges
+        # at its commas. None if the document does not start with a balanced array.
+        if not self.complete or not self.kinds or self.kinds[0] != LBRACKET:
+            return None
+        end = self.pair(0)
+        if end < 0 or self.kinds[end] != RBRACKET:
+            return None
+
+        offsets = self.offsets
+        start = offsets[0] + 1
+        target = max((offsets[end] - start) // pieces, 1)
+        ranges = []
+        for comma in self.commas(0):
+            if offsets[comma] - start >= target:
+                ranges.append((start, offsets[comma]))
+                start = offsets[comma] + 1
+        ranges.append((start, offsets[end]))
+        return ranges
+
+
+def offset_array(size: int) -> array:
+    # 4 bytes per entry, unless the document is too large for them
+    return array('i' if size < 2 ** 31 else 'q')
+
+
+def build_with_regex(data: str | bytes) -> Tuple[array, bytes, bool]:
+    is_text = isinstance(data, str)
+    pattern = STRUCTURAL_STR if is_text else STRUCTURAL_BYTES
+    # filled straight from the match iterator, without a list of every offset in between
+    offsets = offset_array(len(data))
+    offsets.extend(map(re.Match.start, pattern.finditer(data)))
+    characters = map(data.__getitem__, offsets)
+    kinds = bytes(map(ord, characters) if is_text else characters)
+
+    # only the last string can be unterminated, since it runs to the end of the document
+    last_string = kinds.rfind(b'"')
+    complete = last_string < 0 or pattern.match(data, offsets[last_string]).group(1) is not None
+    return offsets, kinds, complete
+
+
+def build_with_numpy(data: str | bytes) -> Tuple[array, bytes, bool]:
+    # Same result as build_with_regex from array operations over one BLOCK_SIZE block at a
+    # time, so memory beyond the index itself stays proportional to the block. Whether a
+    # string is open, and the run of backslashes the block ends with, carry over to the next.
+    offsets = offset_array(len(data))
+    dtype = numpy.dtype(offsets.typecode)
+    kinds = bytearray()
+    chars = None if isinstance(data, str) else numpy.frombuffer(data, dtype=numpy.uint8)
+    in_string = False
+    backslashes = 0
+    for start in range(0, len(data), BLOCK_SIZE):
+        if chars is None: # callers only pass ASCII text, so offsets stay the same
+            block = numpy.frombuffer(data[start:start + BLOCK_SIZE].encode('ascii'), dtype=numpy.uint8)
+        else:
+            block = chars[start:start + BLOCK_SIZE]
+        found, in_string, backslashes = index_block(block, in_string, backslashes)
+        offsets.frombytes((found + start).astype(dtype).tobytes())
+        kinds += block[found].tobytes()
+    return offsets, bytes(kinds), not in_string
+
+
+def index_block(block: 'numpy.ndarray', in_string: bool, backslashes: int) -> Tuple['numpy.ndarray', bool, int]:
+    # Entries of one block, whether it ends inside a string and the length of the run of
+    # backslashes it ends with. A quote outside a string always opens one; inside, only a
+    # quote after an even run of backslashes closes it, as in the STRUCTURAL pattern.
+    quotes = numpy.flatnonzero(block == QUOTE)
+    slashes = numpy.flatnonzero(block == BACKSLASH)
+
+    # backslash runs are measured only in front of quotes
+    run_starts = slashes[numpy.diff(slashes, prepend=-2) != 1]
+    run = numpy.where(quotes == 0, backslashes, 0)
+    if not len(run_starts):
+        backslashes = 0
+    else:
+        after_slash = numpy.zeros(len(quotes), dtype=bool)
+        after_slash[quotes > 0] = block[quotes[quotes > 0] - 1] == BACKSLASH
+        run_start = run_starts[numpy.maximum(numpy.searchsorted(run_starts, quotes, side='right') - 1, 0)]
+        run = numpy.where(after_slash, quotes - run_start + numpy.where(run_start == 0, backslashes, 0), run)
+        if slashes[-1] == len(block) - 1:
+            backslashes = len(block) - run_starts[-1] + (backslashes if run_starts[-1] == 0 else 0)
+        else:
+            backslashes = 0
+    escaped = run % 2 == 1
+
+    # An escaped quote leaves the document inside a string whichever side it was on, and
+    # every other quote flips it, so the state after each quote only depends on the quotes
+    # since the last escaped one
+    flips = numpy.cumsum(~escaped)
+    last_escaped = numpy.maximum.accumulate(numpy.where(escaped, numpy.arange(len(quotes)), -1))
+    flips_since = flips - numpy.where(last_escaped >= 0, flips[last_escaped], 0)
+    inside = numpy.concatenate(([in_string], numpy.where(last_escaped >= 0, True, in_string) ^ (flips_since % 2 == 1)))
+
+    opening = quotes[~inside[:-1]]
+    structural = numpy.flatnonzero(STRUCTURAL_CHARACTERS[block])
+    structural = structural[~inside[numpy.searchsorted(quotes, structural)]]
+    return numpy.sort(numpy.concatenate((opening, structural))), bool(inside[-1]), backslashes
+
+
+def pair_brackets(kinds: bytes) -> array:
+    pairs = array('q', [-1]) * len(kinds)
+    stack = []
+    for entry, kind in enumerate(kinds):
+        if kind in OPENERS:
+            stack.append(entry)
+        elif kind in CLOSERS and stack:
+            opener = stack.pop()
+            pairs[opener] = entry
+            pairs[entry] = opener
+    return pairs
@@ -0,0 +1,165 @@
+import re
+from typing import NamedTuple
+from .json_parser import check_input
+from .fast_parser import FastParser
+from .scanner import TokenType, MAX_DEPTH, BYTES_TYPES, UTF8_BOM, NUMBER_START
+
+# The fast path replaces every valid string with KEY and every other valid scalar with VALUE,
+# then collapses innermost containers into VALUE one nesting level per pass. Raw control
+# characters are never valid JSON, so neither placeholder can be confused with the input.
+VALUE, KEY = '\x00', '\x01'
+STRING_PREFIX = r'"(?:[^"\\\x00-\x1f]++|\\["\\/bfnrt]|\\u[0-9a-fA-F]{4})*+'
+STRING = re.compile(STRING_PREFIX + '"')
+VALID_PREFIX = re.compile(STRING_PREFIX) # ends where an invalid string goes wrong
+SCALAR = re.compile(r'-?(?:0|[1-9][0-9]*+)(?:\.[0-9]++)?(?:[eE][-+]?[0-9]++)?|true|false|null')
+WHITESPACE = re.compile(r'[ \t\n\r]++')
+CONTAINER = re.compile(r'\[(?:[\x00\x01](?:,[\x00\x01])*+)?\]|\{(?:\x01:[\x00\x01](?:,\x01:[\x00\x01])*+)?\}')
+
+
+class JSONError(NamedTuple):
+    message: str # the error parse_fast() raises for the same document
+    line: int # 1-based
+    column: int # 1-based, in characters
+    offset: int # 0-based, in bytes of the UTF-8 input
+
+
+def validate(json_string: str | bytes, max_depth: int = MAX_DEPTH) -> JSONError | None:
+    # Checks a document against parse()'s rules without building any values. Returns None if
+    # it is valid, otherwise its first error. Valid documents are checked by a few regex passes
+    # over the whole text; only an invalid one is walked token by token to locate the error.
+    if not isinstance(json_string, (str, *BYTES_TYPES)):
+        check_input(json_string) # raises
+    skipped = 0
+    if isinstance(json_string, BYTES_TYPES):
+        data = bytes(json_string)
+        if data.startswith(UTF8_BOM):
+            skipped = len(UTF8_BOM)
+        try:
+            json_string = data[skipped:].decode('utf-8')
+        except UnicodeDecodeError as e:
+            return invalid_utf8(data[skipped:], e.start, skipped, max_depth)
+
+    if is_valid(json_string, max_depth):
+        return None
+    return locate(json_string, skipped, max_depth)
+
+
+def is_valid(json_string: str, max_depth: int) -> bool:
+    if json_string[:1] not in ('{', '[') or VALUE in json_string or KEY in json_string:
+        return False
+    reduced = WHITESPACE.sub('', SCALAR.sub(VALUE, STRING.sub(KEY, json_string)))
+    for _ in range(max_depth - 1):
+        reduced, count = CONTAINER.subn(VALUE, reduced)
+        if count == 0:
+            break
+    return reduced == VALUE
+
+
+def locate(json_string: str, skipped: int, max_depth: int) -> JSONError | None:
+    if not json_string.strip():
+        return error_at(json_string, len(json_string), "Invalid JSON: Input is empty or contains only whitespace.", skipped)
+    validator = Validator(json_string, max_depth)
+    try:
+        validator.parse()
+    except Exception as e:
+        return error_at(json_string, min(validator.start, len(json_string)), str(e), skipped)
+    return None
+
+
+def invalid_utf8(data: bytes, bad: int, skipped: int, max_depth: int) -> JSONError:
+    # A syntax error in the text before the first invalid byte comes first
+    json_string = data.decode('utf-8', 'surrogateescape')
+    position = len(data[:bad].decode('utf-8'))
+    error = locate(json_string, skipped, max_depth)
+    if error is not None and error.offset < skipped + bad:
+        return error
+    line = data.count(b'\n', 0, bad) + 1
+    return error_at(json_string, position, f"Invalid JSON: Invalid UTF-8 at line {line}.", skipped)
+
+
+def error_at(json_string: str, position: int, message: str, skipped: int) -> JSONError:
+    line_start = json_string.rfind('\n', 0, position) + 1
+    offset = skipped + len(json_string[:position].encode('utf-8', 'surrogatepass'))
+    return JSONError(message, json_string.count('\n', 0, position) + 1, position - line_start + 1, offset)
+
+
+class Validator(FastParser):
+    # FastParser's grammar and error messages, building nothing: strings are matched by a regex
+    # and only decoded when it fails, to raise parse()'s error, and numbers aren't converted.
+    # start is kept at the value or token being read, so an error can be located.
+
+    def parse(self):
+        self.start = 0
+        super().parse()
+
+    def parse_value(self):
+        # Containers are walked on an explicit stack of their closing brackets instead of by
+        # recursion, so any max_depth works; the checks and messages are parse_fast's
+        closers = []
+        while True:
+            self.skip_whitespace()
+            self.start = self.current_position
+            char = self.peek()
+            if char == '{' or char == '[':
+                self.increase_depth()
+                self.current_position += 1
+                closer = '}' if char == '{' else ']'
+                self.skip_whitespace()
+                if self.peek() != closer:
+                    closers.append(closer)
+                    if closer == '}':
+                        self.check_key()
+                    continue
+                self.current_position += 1
+                self.decrease_depth()
+            elif char == '"':
+                self.check_string()
+            elif char in NUMBER_START:
+                self.current_position += 1
+                self.scan_number()
+            elif char.isalpha():
+                self.current_position += 1
+                self.scan_keyword()
+            else:
+                self.error("Unexpected input")
+
+            # a value is complete: close every container it completes, up to the next comma
+            while closers:
+                closer = closers[-1]
+                self.skip_whitespace()
+                char = self.peek()
+                if char == ',':
+                    self.current_position += 1
+                    self.skip_whitespace()
+                    if self.peek() == closer:
+                        self.error("Unexpected trailing comma")
+                    if closer == '}':
+                        self.check_key()
+                    break
+                if char != closer:
+                    self.error(f"Expected ',' or '{closer}', but found something else.")
+                self.current_position += 1
+                self.decrease_depth()
+                closers.pop()
+            else:
+                return
+
+    def check_key(self):
+        # A member's key and colon, up to its value
+        if self.peek() != '"':
+            self.error(f"Expected {TokenType.STRING}")
+        self.start = self.current_position
+        self.check_string()
+        self.skip_whitespace()
+        if self.peek() != ':':
+            self.error(f"Expected {TokenType.COLON}")
+        self.current_position += 1
+
+    def check_string(self):
+        match = STRING.match(self.json_string, self.current_position)
+        if match is not None:
+            self.current_position = match.end()
+            return
+        self.start = VALID_PREFIX.match(self.json_string, self.current_position).end()
+        self.current_position += 1
+        self.scan_string() # raises the same error parse() would
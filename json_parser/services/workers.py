@@ -0,0 +1,127 @@
+import asyncio
+import atexit
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+from .json_parser import JSONValue, Parser, parse
+from .extract import extract, path_trie, lookup
+from .scanner import MAX_DEPTH
+
+OFFLOAD_SIZE = 256 * 1024 # bytes; smaller bodies are parsed on the event loop
+CHUNK_SIZE = 64 * 1024 # bytes read from a request body at a time
+PENDING_PER_WORKER = 2
+SLOT_POLL_INTERVAL = 0.01 # seconds between tries when waiting for a free slot
+
+
+class Busy(Exception):
+    pass
+
+
+def service_settings() -> Dict[str, Any]:
+    # settings.JSON_PARSER_SERVICE, e.g. {'WORKERS': 4, 'OFFLOAD_SIZE': 1_000_000}
+    try:
+        from django.conf import settings
+        options = getattr(settings, 'JSON_PARSER_SERVICE', {}) if settings.configured else {}
+    except ImportError:
+        options = {}
+    return {
+        'workers': options.get('WORKERS'),
+        'max_pending': options.get('MAX_PENDING'),
+        'offload_size': options.get('OFFLOAD_SIZE', OFFLOAD_SIZE),
+        'chunk_size': options.get('CHUNK_SIZE', CHUNK_SIZE),
+        'max_depth': options.get('MAX_DEPTH', MAX_DEPTH),
+    }
+
+
+_worker_pool = None
+_worker_pool_lock = threading.Lock()
+
+
+def get_worker_pool() -> 'WorkerPool':
+    global _worker_pool
+    with _worker_pool_lock:
+        if _worker_pool is None:
+            options = service_settings()
+            _worker_pool = WorkerPool(options['workers'], options['max_pending'])
+        return _worker_pool
+
+
+@atexit.register
+def shutdown_worker_pool():
+    # Stops the shared pool's worker processes; the next get_worker_pool() starts a new one
+    global _worker_pool
+    with _worker_pool_lock:
+        if _worker_pool is not None:
+            _worker_pool.shutdown()
+            _worker_pool = None
+
+
+class WorkerPool:
+    # A process pool for CPU-heavy documents that takes at most max_pending jobs at a time.
+    # Past that, run() raises Busy instead of queueing, so a burst of large requests can't
+    # pile up bodies in memory. A slot is freed when the job ends, even if its caller is gone.
+
+    def __init__(self, workers: int | None = None, max_pending: int | None = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.workers * PENDING_PER_WORKER
+        self.slots = threading.BoundedSemaphore(self.max_pending)
+        self.executor: ProcessPoolExecutor | None = None
+        self.lock = threading.Lock()
+
+    async def run(self, function: Callable, *args, wait: bool = False) -> Any:
+        # With wait=True the caller waits for a free slot instead of getting Busy, for work
+        # that can no longer be turned away, like the rest of a response already streaming
+        while not self.slots.acquire(blocking=False):
+            if not wait:
+                raise Busy(f"All {self.max_pending} worker slots are in use, try again later.")
+            await asyncio.sleep(SLOT_POLL_INTERVAL)
+        try:
+            future = self.get_executor().submit(function, *args)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        return await asyncio.wrap_future(future)
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        with self.lock:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(self.workers)
+            return self.executor
+
+    def shutdown(self):
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown(cancel_futures=True)
+                self.executor = None
+
+
+def parse_body(data: bytes, paths: Sequence[str], max_depth: int) -> JSONValue:
+    # Runs in a worker process: the whole document, or {path: value} for the requested paths
+    if not paths:
+        return parse(data, max_depth)
+    try:
+        json_string = data.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        return parse(data, max_depth) # raises the usual error for invalid UTF-8
+    return extract(json_string, paths, max_depth)
+
+
+def parse_lines(numbers: Sequence[int], lines: Sequence[bytes], paths: Sequence[str], max_depth: int) -> Tuple[List[JSONValue], str | None]:
+    # Runs in a worker process, or inline for a small batch. Stops at the first invalid line
+    # and returns its error along with the values of the lines before it.
+    parser = Parser(max_depth)
+    trie = path_trie(paths) if paths else None
+    results = []
+    for number, line in zip(numbers, lines):
+        try:
+            value = parser.parse(line)
+        except Exception as e:
+            return results, f"Line {number}: {e}"
+        if trie is not None:
+            found = {}
+            lookup(value, trie, found)
+            value = found
+        results.append(value)
+    return results, None
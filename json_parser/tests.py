@@ -1,8 +1,39 @@
 from django.test import TestCase
-from json_parser.services.json_parser import parse
+from json_parser.services.json_parser import parse, parse_many, Parser
+from json_parser.services.fast_parser import parse_fast
+from json_parser.services.incremental import IncrementalParser
+from json_parser.services.event_parser import iterparse, items
+from json_parser.services.extract import extract, parse_path
+from json_parser.services.file_parser import parse_file, iterparse_file
+from json_parser.services.cache import ParseCache
+from json_parser.services.batch import parse_batch, parse_ndjson
+from json_parser.services.parallel import parse_parallel, parse_file_parallel, split_array
+from unittest import mock, skipUnless
+from json_parser.services import structural
+from json_parser.services.structural import StructuralIndex
+from json_parser.services.lazy import parse_lazy, LazyObject, LazyArray
+from collections.abc import Mapping, Sequence
+from json_parser.services import columnar
+from json_parser.services.columnar import parse_columnar
+from json_parser.services.validate import validate, JSONError
+from json_parser.services.schema import SchemaParser, compile_schema
+from json_parser.services.serializer import dumps, dump, iterdumps
+from json_parser.services.profiling import profile, ParseStats, ProfilingParser, ProfilingScanner, ProfilingByteScanner
+from types import MappingProxyType
+import io
+from django.test import override_settings
+import tempfile
+from decimal import Decimal
+from json_parser.services.scanner import Scanner, TokenType, TokenBuffer, make_scanner
 import os
 import json
 from pathlib import Path
+from django.core.management import call_command
+from json_parser import benchmarks
+from json_parser import views
+from json_parser.services.workers import WorkerPool, Busy, get_worker_pool, parse_lines, shutdown_worker_pool
+import asyncio
+import time
 
 # Create your tests here.
 class JsonParserTestCase(TestCase):
@@ -105,6 +136,88 @@ class JsonParserTestCase(TestCase):
             parse(json_string)
         self.assertTrue("Invalid JSON: Control character '\\x01' at line 1." in str(context.exception))
 
+    def test_scanner_iter_tokens_is_lazy(self):
+        scanner = Scanner('[1, "two", true] ]')
+        tokens = scanner.iter_tokens()
+        self.assertEqual(next(tokens).token_type, TokenType.LBRACKET)
+        self.assertEqual(next(tokens).value, "1")
+        self.assertEqual(len(scanner.tokens), 0)
+        self.assertEqual([token.token_type for token in tokens], [TokenType.COMMA, TokenType.STRING, TokenType.COMMA, TokenType.BOOLEAN, TokenType.RBRACKET, TokenType.RBRACKET, TokenType.EOF])
+
+    def test_scan_tokens_still_materializes(self):
+        scanner = Scanner('{"a": null}')
+        tokens = scanner.scan_tokens()
+        self.assertEqual([token.token_type for token in tokens], [TokenType.LBRACE, TokenType.STRING, TokenType.COLON, TokenType.NULL, TokenType.RBRACE, TokenType.EOF])
+        self.assertIs(scanner.tokens, tokens)
+
+    def test_token_buffer_values_are_sliced_lazily(self):
+        tokens = Scanner('{"k\\u00e9y": [-1.5e3, true, null]} ').scan_tokens()
+        self.assertIsInstance(tokens, TokenBuffer)
+        self.assertEqual(len(tokens), 12)
+        self.assertEqual(tokens[1].value, "k\u00e9y")
+        self.assertEqual(tokens[4].token_type, TokenType.NUMBER)
+        self.assertEqual(tokens[4].value, "-1.5e3")
+        self.assertEqual([tokens[6].value, tokens[8].value], [True, None])
+        self.assertEqual(tokens[-1].token_type, TokenType.EOF)
+        self.assertIsNone(tokens[-1].value)
+        self.assertEqual((tokens.starts[1], tokens.ends[1]), (1, 11))
+
+    def test_token_buffer_decodes_without_a_scanner(self):
+        tokens = Scanner('["a\\"b\\\\c\\u00e9\\n", "plain", 12, false]').scan_tokens()
+        self.assertEqual([token.value for token in tokens], ['[', 'a"b\\c\u00e9\n', ',', 'plain', ',', '12', ',', False, ']', None])
+        tokens = make_scanner('\ufeff'.encode() + '{"caf\u00e9": "\\t"}'.encode()).scan_tokens()
+        self.assertEqual([token.value for token in tokens], ['{', 'caf\u00e9', ':', '\t', '}', None])
+
+    def test_scan_tokens_reports_invalid_input(self):
+        for json_string, message in (('["a\\x"]', "Illegal backslash escape x"), ('[nul]', "Unexpected keyword: nul"), ('[01]', "Leading zeros"), ('[@]', "Unexpected character: @")):
+            with self.subTest(json_string=json_string):
+                with self.assertRaises(Exception) as context:
+                    Scanner(json_string).scan_tokens()
+                self.assertIn(message, str(context.exception))
+
+    def test_streaming_allocates_no_token_buffer(self):
+        scanner = make_scanner('[1, 2]')
+        list(scanner.iter_tokens())
+        self.assertIsNone(scanner.token_buffer)
+
+    def test_token_buffer_is_compact(self):
+        tokens = Scanner('[' + ', '.join(f'"value {i}"' for i in range(1000)) + ']').scan_tokens()
+        size = tokens.types.itemsize + tokens.starts.itemsize + tokens.ends.itemsize
+        self.assertLessEqual(size, 17)
+        self.assertEqual(len(tokens), 2002)
+
+    def test_streaming_error_reports_line_of_token(self):
+        json_string = '[\n1,\n2,\n]\n\n'
+        with self.assertRaises(Exception) as context:
+            parse(json_string)
+        self.assertTrue("Invalid JSON: Unexpected trailing comma at line 4 and index 5, token type: rbracket." in str(context.exception))
+
+    def test_string_with_escapes_between_plain_runs(self):
+        json_string = r'["plain \"quoted\" tab\t and \u00e9 end", "\\"]'
+        self.assertEqual(parse(json_string), ['plain "quoted" tab\t and \u00e9 end', '\\'])
+
+    def test_control_character_after_plain_run(self):
+        with self.assertRaises(Exception) as context:
+            parse('["a long plain run\nsplit"]')
+        self.assertTrue("Invalid JSON: Control character '\\n' at line 1." in str(context.exception))
+
+    def test_unterminated_string(self):
+        with self.assertRaises(Exception) as context:
+            parse('["never closed')
+        self.assertEqual(str(context.exception), "Invalid JSON: Unexpected end of input in string.")
+
+    def test_malformed_numbers_keep_their_errors(self):
+        cases = {
+            '[1.]': "Invalid JSON: Unexpected character after '.' at line 1.",
+            '[1e+]': "Invalid JSON: Unexpected character after exponent at line 1.",
+            '[-a]': "Invalid JSON: Unexpected character after '-' at line 1.",
+            '[-012]': "Invalid JSON: Leading zeros in number at line 1.",
+        }
+        for json_string, message in cases.items():
+            with self.assertRaises(Exception) as context:
+                parse(json_string)
+            self.assertEqual(str(context.exception), message)
+
     # Test cases for Coding challenges test json
     def read_file(self, file):
         with open(file, "r") as f:
@@ -216,4 +329,1016 @@ class JsonParserTestCase(TestCase):
                     self.assertEqual(result, expected)
                    
 
- 
\ No newline at end of file
+ 
+
+class ParserTestCase(TestCase):
+
+    def test_parser_is_reusable_across_documents(self):
+        parser = Parser()
+        self.assertEqual(parser.parse('{"a": 1}'), {"a": 1})
+        self.assertEqual(parser.parse('[true, null]'), [True, None])
+
+    def test_parser_recovers_after_invalid_document(self):
+        parser = Parser()
+        with self.assertRaises(Exception):
+            parser.parse('{"a": [1,]}')
+        self.assertEqual(parser.parse('{"a": [1]}'), {"a": [1]})
+
+    def test_parser_has_no_instance_dict(self):
+        self.assertFalse(hasattr(Parser(), '__dict__'))
+
+    def test_max_depth_is_configurable(self):
+        depth = 5000
+        result = parse('[' * depth + ']' * depth, max_depth=depth + 1)
+        levels = 1
+        while result:
+            result = result[0]
+            levels += 1
+        self.assertEqual(levels, depth)
+
+    def test_max_depth_exceeded_with_custom_limit(self):
+        with self.assertRaises(Exception) as context:
+            Parser(max_depth=5).parse('{"a": [[{"b": [1]}]]}')
+        self.assertEqual(str(context.exception), "Maximum depth exceeded. Maximum depth is 5. Current depth is at 5 at line 1 and index 8, token type: lbracket")
+
+    def test_empty_containers_do_not_count_towards_depth(self):
+        json_string = '[' + '{}, [], ' * 30 + '{}]'
+        self.assertEqual(len(parse(json_string)), 61)
+
+    def test_missing_comma_in_array(self):
+        with self.assertRaises(Exception) as context:
+            parse('[1 2]')
+        self.assertEqual(str(context.exception), "Invalid JSON: Expected ',' or ']', but found something else. at line 1 and index 2, token type: number.")
+
+    def test_parse_many(self):
+        documents = (f'{{"id": {i}, "tags": ["a", "b"]}}' for i in range(3))
+        self.assertEqual(parse_many(documents), [{"id": i, "tags": ["a", "b"]} for i in range(3)])
+
+    def test_repeated_keys_share_one_string(self):
+        result = parse('[{"na\\u006de": "a", "id": 1}, {"na\\u006de": "b", "id": 2}]')
+        self.assertEqual(result, [{"name": "a", "id": 1}, {"name": "b", "id": 2}])
+        first, second = (list(record) for record in result)
+        self.assertIs(first[0], second[0])
+        self.assertIs(first[1], second[1])
+
+    def test_key_cache_is_kept_across_documents(self):
+        parser = Parser()
+        first = parser.parse(b'{"caf\xc3\xa9": 1}')
+        second = parser.parse(bytearray(b'{"caf\xc3\xa9": 2}'))
+        self.assertIs(list(first)[0], list(second)[0])
+        self.assertEqual(second, {"caf\u00e9": 2})
+
+    def test_numbers_are_classified_while_scanning(self):
+        result = parse('[0, -0, 999, -99, 1000, 12345678901234567890, 1.0, 1e2, -2E-3, 0.5]')
+        self.assertEqual(result, [0, 0, 999, -99, 1000, 12345678901234567890, 1.0, 100.0, -0.002, 0.5])
+        self.assertEqual([type(value) for value in result], [int] * 6 + [float] * 4)
+        self.assertEqual(parse_fast('[-0, 1000, 1e2]'), [0, 1000, 100.0])
+
+    def test_only_ascii_digits_make_numbers(self):
+        cases = {
+            '[\u0663]': "Unexpected character: \u0663 at line 1.",
+            '[1\u0663]': "Unexpected character: \u0663 at line 1.",
+            '[-\u0663]': "Invalid JSON: Unexpected character after '-' at line 1.",
+            '[1.\u0663]': "Invalid JSON: Unexpected character after '.' at line 1.",
+            '["\\u\u0663\u0663\u0663\u0663"]': "Invalid JSON: Invalid unicode escape sequence.",
+        }
+        for json_string, message in cases.items():
+            for parser in (parse, parse_fast, lambda json_string: parse(json_string.encode())):
+                with self.subTest(json_string=json_string), self.assertRaises(Exception) as context:
+                    parser(json_string)
+                self.assertEqual(str(context.exception), message)
+            self.assertEqual(validate(json_string).message, message)
+
+    def test_parse_int_and_parse_float_hooks(self):
+        json_string = '{"price": 19.99, "qty": 3, "big": 1e400}'
+        expected = {"price": Decimal("19.99"), "qty": "3", "big": Decimal("1e400")}
+        self.assertEqual(parse(json_string, parse_float=Decimal, parse_int=str), expected)
+        self.assertEqual(parse(json_string.encode(), parse_float=Decimal, parse_int=str), expected)
+        self.assertEqual(parse_fast(json_string, parse_float=Decimal, parse_int=str), expected)
+        self.assertEqual(parse_many([json_string], parse_float=Decimal, parse_int=str), [expected])
+        events = list(iterparse('[0.1, 2]', parse_float=Decimal))
+        self.assertEqual([value for event, _, value in events if event == 'number'], [Decimal("0.1"), 2])
+
+        parser = IncrementalParser(parse_float=Decimal)
+        for chunk in ('{"price": 19', '.99, "qty": 3}'):
+            parser.feed(chunk)
+        self.assertEqual(parser.close(), {"price": Decimal("19.99"), "qty": 3})
+
+    def test_key_cache_only_holds_keys_and_respects_size(self):
+        parser = Parser(key_cache_size=2)
+        parser.parse('{"a": "value", "b": ["item"], "c": 3}')
+        self.assertEqual(parser.key_cache, {'a': 'a', 'b': 'b'})
+
+        parser = Parser(key_cache_size=0)
+        self.assertEqual(parser.parse('{"a": {"a": 1}}'), {"a": {"a": 1}})
+        self.assertIsNone(parser.key_cache)
+
+
+class BytesInputTestCase(TestCase):
+
+    def test_bytes_like_inputs(self):
+        data = '{"name": "J\u00f6hn ☃", "escaped": "\\u00e9\\n", "n": [1, -2.5e3, true, null]}'.encode("utf-8")
+        expected = parse(data.decode("utf-8"))
+        for json_bytes in (data, bytearray(data), memoryview(data)):
+            self.assertEqual(parse(json_bytes), expected)
+
+    def test_byte_order_mark_is_skipped(self):
+        self.assertEqual(parse(b'\xef\xbb\xbf{"a": [1]}'), {"a": [1]})
+        with self.assertRaises(Exception) as context:
+            parse(b'\xef\xbb\xbf \n')
+        self.assertEqual(str(context.exception), "Invalid JSON: Input is empty or contains only whitespace.")
+
+    def test_invalid_utf8(self):
+        for data in (b'["\xff"]', b'["\xed\xa0\x80"]', b'{"a": 1, \xc3}'):
+            with self.assertRaises(Exception) as context:
+                parse(data)
+            self.assertEqual(str(context.exception), "Invalid JSON: Invalid UTF-8 at line 1.")
+
+    def test_errors_match_str_input(self):
+        for json_string in ['{\n"key": "value",\n"k\u00e9y": [\u00e9]\n}', '{"a": [1,\n]}', '["tab\there"]', '[1] 2']:
+            with self.assertRaises(Exception) as expected:
+                parse(json_string)
+            with self.assertRaises(Exception) as context:
+                parse(json_string.encode("utf-8"))
+            self.assertEqual(str(context.exception), str(expected.exception))
+
+    def test_json_org_test_cases(self):
+        test_dir = Path("json_parser/tests/json.org_tests/test").resolve()
+        for filename in os.listdir(test_dir):
+            with open(test_dir / filename, 'rb') as file:
+                data = file.read()
+            if "fail" in filename:
+                with self.assertRaises(Exception):
+                    parse(data)
+            else:
+                self.assertEqual(parse(data), json.loads(data))
+
+    def test_iterparse_bytes(self):
+        self.assertEqual(list(items('{"a": ["\u00e9", 2]}'.encode("utf-8"), 'a.item')), ["\u00e9", 2])
+
+    def test_str_engines_decode_bytes(self):
+        data = b'\xef\xbb\xbf{"a": [1, 2.5], "b": "\xc3\xa9"}'
+        for json_bytes in (data, bytearray(data), memoryview(data)):
+            self.assertEqual(parse_fast(json_bytes), {"a": [1, 2.5], "b": "\u00e9"})
+            self.assertEqual(extract(json_bytes, ['$.b']), {'$.b': "\u00e9"})
+            self.assertEqual(parse_lazy(json_bytes)["a"][1], 2.5)
+        with self.assertRaises(Exception) as context:
+            parse_fast(b'[1,\n"\xff"]')
+        self.assertEqual(str(context.exception), "Invalid JSON: Invalid UTF-8 at line 2.")
+
+
+class FileParserTestCase(TestCase):
+
+    def write_file(self, data):
+        file = tempfile.NamedTemporaryFile(suffix=".json", delete=False)
+        file.write(data)
+        file.close()
+        self.addCleanup(os.remove, file.name)
+        return file.name
+
+    def test_parse_file(self):
+        self.assertEqual(parse_file("json_parser/tests/step4/valid2.json"), {
+                                            "key": "value",
+                                            "key-n": 101,
+                                            "key-o": {
+                                                "inner key": "inner value"
+                                            },
+                                            "key-l": ["list value"]
+                                            })
+
+    def test_parse_file_errors_match_parse(self):
+        with self.assertRaises(Exception) as context:
+            parse_file("json_parser/tests/step4/invalid.json")
+        self.assertTrue("Unexpected character: ' at line 7." in str(context.exception))
+
+    def test_parse_file_with_byte_order_mark(self):
+        path = self.write_file('\ufeff{"k\u00e9y": ["\u2603"]}'.encode("utf-8"))
+        self.assertEqual(parse_file(path), {"k\u00e9y": ["\u2603"]})
+
+    def test_empty_file(self):
+        for path in ("json_parser/tests/step1/invalid.json", self.write_file(b"")):
+            with self.assertRaises(Exception) as context:
+                parse_file(path)
+            self.assertEqual(str(context.exception), "Invalid JSON: Input is empty or contains only whitespace.")
+
+    def test_iterparse_file(self):
+        self.assertEqual(list(iterparse_file("json_parser/tests/step2/valid.json")), [
+            ('start_map', '', None),
+            ('map_key', '', 'key'),
+            ('string', 'key', 'value'),
+            ('end_map', '', None),
+        ])
+
+
+class FastParserTestCase(TestCase):
+
+    def test_matches_parse_on_valid_documents(self):
+        for json_string in [
+            '{"name": "John", "age": 30, "height": 1.75, "isStudent": false, "spouse": null, "grades": [90, 85, 88]}',
+            '[1, [2, [3, [4, [5]]]]]',
+            '{"a": [1, {"b": [2, {"c": 3}]}], "e": "\\u00e9\\n", "empty": {}, "none": []}',
+            '[\n  -0.5e-3,\n  1E+2\n]\n',
+        ]:
+            self.assertEqual(parse_fast(json_string), parse(json_string))
+
+    def test_json_org_test_cases(self):
+        test_dir = Path("json_parser/tests/json.org_tests/test").resolve()
+        for filename in os.listdir(test_dir):
+            with open(test_dir / filename, 'r', encoding="utf-8") as file:
+                json_string = file.read()
+            if "fail" in filename:
+                with self.assertRaises(Exception):
+                    parse_fast(json_string)
+            else:
+                self.assertEqual(parse_fast(json_string), json.loads(json_string))
+
+    def test_errors_name_token_type_and_line(self):
+        with self.assertRaises(Exception) as context:
+            parse_fast('{\n"key1": "value1",\n"key2": "value2",\n}')
+        self.assertEqual(str(context.exception), "Invalid JSON: Unexpected trailing comma at line 4 and position 38, token type: rbrace.")
+
+    def test_extra_value_after_close(self):
+        with self.assertRaises(Exception) as context:
+            parse_fast('{"object": "value"} "extra value"')
+        self.assertEqual(str(context.exception), "Invalid JSON: Extra value after close at line 1, token type: string.")
+
+    def test_missing_comma_in_array(self):
+        with self.assertRaises(Exception) as context:
+            parse_fast('[1 2]')
+        self.assertTrue("Expected ',' or ']'" in str(context.exception))
+
+    def test_deeply_nested_arrays(self):
+        with self.assertRaises(Exception) as context:
+            parse_fast('[' * 20 + ']' * 20)
+        self.assertTrue("Maximum depth exceeded. Maximum depth is 20. Current depth is at 20 at line 1" in str(context.exception))
+
+
+class IncrementalParserTestCase(TestCase):
+
+    def feed_in_chunks(self, data, size):
+        parser = IncrementalParser()
+        for i in range(0, len(data), size):
+            parser.feed(data[i:i + size])
+        return parser.close()
+
+    def test_matches_parse_for_every_chunk_size(self):
+        json_string = '{"name": "J\\u00f6hn \\"Jr\\"", "age": -30, "height": 1.75e+0,\n "ok": true, "none": null, "grades": [90, 85, []]}'
+        for size in range(1, 12):
+            self.assertEqual(self.feed_in_chunks(json_string, size), parse(json_string))
+
+    def test_bytes_split_inside_multibyte_characters(self):
+        data = '["snow ☃ man", "é"]'.encode("utf-8")
+        self.assertEqual(self.feed_in_chunks(data, 1), ["snow ☃ man", "é"])
+
+    def test_json_org_test_cases(self):
+        test_dir = Path("json_parser/tests/json.org_tests/test").resolve()
+        for filename in os.listdir(test_dir):
+            with open(test_dir / filename, 'rb') as file:
+                data = file.read()
+            if "fail" in filename:
+                with self.assertRaises(Exception):
+                    self.feed_in_chunks(data, 3)
+            else:
+                self.assertEqual(self.feed_in_chunks(data, 3), json.loads(data))
+
+    def test_errors_match_parse(self):
+        for json_string in ['{"a":\n\n[1,\n]}', '[1] 2', '[tru]', '[1.]', '{"a": 1', '  [1]', '   ']:
+            with self.assertRaises(Exception) as expected:
+                parse(json_string)
+            with self.assertRaises(Exception) as context:
+                self.feed_in_chunks(json_string, 2)
+            self.assertEqual(str(context.exception), str(expected.exception))
+
+    def test_byte_order_mark_is_skipped(self):
+        self.assertEqual(self.feed_in_chunks(b'\xef\xbb\xbf[1, 2]', 1), [1, 2])
+
+    def test_escaped_quotes_do_not_rescan_a_long_string(self):
+        value = '\\"a\\\\' * 1000
+        json_string = '["' + value + '", "\\\\"]'
+        parser = IncrementalParser()
+        with mock.patch.object(IncrementalParser, 'scan', autospec=True, side_effect=IncrementalParser.scan) as scan:
+            for i in range(0, len(json_string), 7):
+                parser.feed(json_string[i:i + 7])
+            self.assertEqual(parser.close(), json.loads(json_string))
+        self.assertLessEqual(scan.call_count, 6)
+
+    def test_backslash_at_chunk_boundary(self):
+        for size in range(1, 8):
+            with self.subTest(size=size):
+                self.assertEqual(self.feed_in_chunks('["\\\\", "\\"x\\\\\\"", "\\u00e9"]', size), ['\\', '"x\\"', '\u00e9'])
+
+    def test_feed_after_close(self):
+        parser = IncrementalParser()
+        parser.feed('[1]')
+        parser.close()
+        with self.assertRaises(Exception) as context:
+            parser.feed('[2]')
+        self.assertEqual(str(context.exception), "Invalid JSON: Cannot feed a closed parser.")
+
+
+class EventParserTestCase(TestCase):
+
+    def test_iterparse_events(self):
+        json_string = '{"a": [1, {"b": null}], "c": "d"}'
+        self.assertEqual(list(iterparse(json_string)), [
+            ('start_map', '', None),
+            ('map_key', '', 'a'),
+            ('start_array', 'a', None),
+            ('number', 'a.item', 1),
+            ('start_map', 'a.item', None),
+            ('map_key', 'a.item', 'b'),
+            ('null', 'a.item.b', None),
+            ('end_map', 'a.item', None),
+            ('end_array', 'a', None),
+            ('map_key', '', 'c'),
+            ('string', 'c', 'd'),
+            ('end_map', '', None),
+        ])
+
+    def test_items_builds_one_element_at_a_time(self):
+        json_string = '{"records": [{"id": 1, "tags": ["x"]}, {"id": 2, "tags": []}], "count": 2}'
+        records = items(json_string, 'records.item')
+        self.assertEqual(next(records), {"id": 1, "tags": ["x"]})
+        self.assertEqual(next(records), {"id": 2, "tags": []})
+        self.assertEqual(list(records), [])
+        self.assertEqual(sum(items(json_string, 'records.item.id')), 3)
+
+    def test_items_with_empty_prefix_matches_parse(self):
+        test_dir = Path("json_parser/tests/json.org_tests/test").resolve()
+        for filename in os.listdir(test_dir):
+            if filename.startswith("pass"):
+                with open(test_dir / filename, 'r', encoding="utf-8") as file:
+                    json_string = file.read()
+                self.assertEqual(list(items(json_string, '')), [parse(json_string)])
+
+    def test_errors_are_raised_while_iterating(self):
+        events = iterparse('[1, 2,]')
+        self.assertEqual(next(events), ('start_array', '', None))
+        self.assertEqual(next(events), ('number', 'item', 1))
+        self.assertEqual(next(events), ('number', 'item', 2))
+        with self.assertRaises(Exception) as context:
+            next(events)
+        self.assertEqual(str(context.exception), "Invalid JSON: Unexpected trailing comma at line 1 and index 5, token type: rbracket.")
+
+
+class ExtractTestCase(TestCase):
+
+    json_string = '{"meta": {"count": 2}, "records": [{"id": 1, "name": "a\\"b", "tags": ["x", {"y": [1]}]}, {"id": 2, "name": "c", "tags": []}], "payload": {"user": {"id": 42}}}'
+
+    def test_extract_paths(self):
+        self.assertEqual(extract(self.json_string, ["payload.user.id", "/meta/count", "$.records[0].name", "records[0].tags[1]", "records.1.id"]), {
+            "payload.user.id": 42,
+            "/meta/count": 2,
+            "$.records[0].name": 'a"b',
+            "records[0].tags[1]": {"y": [1]},
+            "records.1.id": 2,
+        })
+
+    def test_missing_paths_are_left_out(self):
+        self.assertEqual(extract(self.json_string, ["payload.user.name", "records[5]", "meta.count.value"]), {})
+
+    def test_nested_requests_under_an_extracted_value(self):
+        self.assertEqual(extract(self.json_string, ["payload", "payload.user.id"]), {"payload": {"user": {"id": 42}}, "payload.user.id": 42})
+
+    def test_whole_document(self):
+        self.assertEqual(extract('[1, 2]', ["", "$"]), {"": [1, 2], "$": [1, 2]})
+
+    def test_parse_path(self):
+        self.assertEqual(parse_path("/a~1b/c~0d/0"), ["a/b", "c~d", "0"])
+        self.assertEqual(parse_path("$.a['b.c'][3].d"), ["a", "b.c", "3", "d"])
+        self.assertEqual(parse_path("a.b"), ["a", "b"])
+
+    def test_skipped_subtrees_are_checked(self):
+        for json_string, message in [
+            ('{"a": [1, {"b": 2]], "c": 3}', "Invalid JSON: Mismatched closing bracket at line 1 and position 17, token type: rbracket."),
+            ('{"a": [1, 2', "Invalid JSON: Unexpected end of input at line 1."),
+            ('{"a": "never closed', "Invalid JSON: Unexpected end of input in string."),
+            ('{"a": ["x\ty"], "c": 3}', "Invalid JSON: Control character '\\t' at line 1."),
+            ('{"a": 1,}', "Invalid JSON: Unexpected trailing comma at line 1 and position 8, token type: rbrace."),
+            ('{"a": 1} 2', "Invalid JSON: Extra value after close at line 1, token type: number."),
+        ]:
+            with self.assertRaises(Exception) as context:
+                extract(json_string, ["c"])
+            self.assertEqual(str(context.exception), message)
+
+    def test_depth_limit_applies_to_skipped_subtrees(self):
+        with self.assertRaises(Exception) as context:
+            extract('{"a": ' + '[' * 25 + ']' * 25 + '}', ["b"])
+        self.assertTrue("Maximum depth exceeded" in str(context.exception))
+
+    def test_max_depth_is_bounded_by_the_recursion_limit(self):
+        deep = '{"a": ' + '[' * 250 + ']' * 250 + '}'
+        self.assertEqual(len(extract(deep, ["a"], max_depth=300)["a"]), 1)
+        with self.assertRaises(Exception) as context:
+            extract(deep, ["a"], max_depth=5000)
+        self.assertEqual(str(context.exception), "max_depth can be at most 300 here, deeper documents would exceed Python's recursion limit. parse() has no such limit.")
+
+    def test_repeated_keys_keep_the_last_value(self):
+        self.assertEqual(parse('{"a": {"b": 1}, "a": 5}'), {"a": 5})
+        self.assertEqual(extract('{"a": {"b": 1}, "a": 5}', ["a.b", "a"]), {"a": 5})
+        self.assertEqual(extract('{"a": 5, "a": {"b": 1}}', ["a.b", "a"]), {"a": {"b": 1}, "a.b": 1})
+        self.assertEqual(extract('{"a": {"b": 1, "c": 2}, "x": 0, "a": {"c": 3}}', ["a.b", "a.c"]), {"a.c": 3})
+
+
+class ParseCacheTestCase(TestCase):
+
+    def test_hits_return_fresh_copies(self):
+        cache = ParseCache()
+        first = cache.parse('{"tags": ["a"], "n": 1}')
+        first["tags"].append("changed")
+        second = cache.parse('{"tags": ["a"], "n": 1}')
+        self.assertEqual(second, {"tags": ["a"], "n": 1})
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_frozen_results_are_shared_and_read_only(self):
+        cache = ParseCache()
+        first = cache.parse(b'{"tags": ["a"]}', frozen=True)
+        self.assertIs(cache.parse(b'{"tags": ["a"]}', frozen=True), first)
+        with self.assertRaises(TypeError):
+            first["tags"] = []
+        self.assertEqual(first["tags"], ("a",))
+
+    def test_evicts_least_recently_used(self):
+        cache = ParseCache(max_entries=2)
+        cache.parse('[1]')
+        cache.parse('[2]')
+        cache.parse('[1]') # [2] is now the oldest
+        cache.parse('[3]')
+        self.assertEqual(cache.stats()["evictions"], 1)
+        cache.parse('[1]')
+        self.assertEqual(cache.stats()["hits"], 2)
+
+        cache = ParseCache(max_bytes=10)
+        cache.parse('[1, 2, 3]')
+        cache.parse('[4, 5, 6]')
+        self.assertEqual(cache.stats()["entries"], 1)
+        self.assertEqual(cache.stats()["bytes"], 9)
+
+    def test_invalid_documents_are_not_cached(self):
+        cache = ParseCache()
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                cache.parse('[1,]')
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    @override_settings(CACHES={'json': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_django_cache_backend(self):
+        cache = ParseCache(backend='json')
+        cache.parse('{"a": [1, 2]}')
+        other = ParseCache(backend='json')
+        self.assertEqual(other.parse('{"a": [1, 2]}'), {"a": [1, 2]})
+        self.assertEqual(other.stats()["hits"], 1)
+
+
+class BatchParserTestCase(TestCase):
+
+    def test_parse_batch_keeps_order(self):
+        documents = [f'{{"id": {i}}}' for i in range(25)]
+        expected = [{"id": i} for i in range(25)]
+        self.assertEqual(parse_batch(documents, workers=2, chunk_size=4), expected)
+        self.assertEqual(parse_batch(documents, workers=1), expected)
+
+    def test_parse_batch_error_names_document(self):
+        documents = ['[1]', '[2]', '[3,]', '[4]']
+        for workers in (1, 2):
+            with self.assertRaises(Exception) as context:
+                parse_batch(documents, workers=workers, chunk_size=1)
+            self.assertTrue(str(context.exception).startswith("Document 2: Invalid JSON: Unexpected trailing comma"))
+
+    def test_parse_ndjson_from_stream_and_path(self):
+        stream = io.StringIO('{"a": 1}\n\n[2]\n{"b": [3]}\n')
+        self.assertEqual(list(parse_ndjson(stream, workers=2, chunk_size=1)), [{"a": 1}, [2], {"b": [3]}])
+
+        with tempfile.NamedTemporaryFile('wb', suffix='.ndjson', delete=False) as f:
+            f.write(b'{"a": 1}\r\n{"a": 2}\n')
+        self.addCleanup(os.remove, f.name)
+        self.assertEqual(list(parse_ndjson(f.name, workers=1)), [{"a": 1}, {"a": 2}])
+
+    def test_parse_ndjson_error_names_line(self):
+        stream = io.BytesIO(b'{"a": 1}\n\n{"a" 2}\n')
+        with self.assertRaises(Exception) as context:
+            list(parse_ndjson(stream, workers=2))
+        self.assertTrue(str(context.exception).startswith("Line 3: Invalid JSON: Expected"))
+
+
+@mock.patch('json_parser.services.parallel.MIN_PARALLEL_SIZE', 0)
+class ParallelParserTestCase(TestCase):
+
+    def test_split_array_cuts_at_top_level_commas(self):
+        json_string = '[1, [2, 3], {"a": ",]"}, 4]'
+        self.assertEqual(split_array(json_string, 100), [(1, 2), (3, 10), (11, 23), (24, 26)])
+        self.assertIsNone(split_array('{"a": [1, 2]}', 2))
+        self.assertIsNone(split_array('[1, 2}', 2))
+
+    def test_parse_parallel_matches_parse(self):
+        json_string = '[' + ',\n'.join(f'{{"id": {i}, "tags": ["a", "b,c"], "nested": [[{i}]]}}' for i in range(200)) + ']'
+        expected = parse(json_string)
+        self.assertEqual(parse_parallel(json_string, workers=2), expected)
+        self.assertEqual(parse_parallel(b'\xef\xbb\xbf' + json_string.encode(), workers=2), expected)
+        self.assertEqual(parse_parallel('{"a": [1, 2]}', workers=2), {"a": [1, 2]})
+
+    def test_parse_parallel_errors_match_parse(self):
+        for json_string in ('[1, 2,\n\n 3,]', '[1,\n\n2,, 3]', '[1, 2}', '[1, 2] 3', '[1, "a\nb"]'):
+            with self.assertRaises(Exception) as expected:
+                parse(json_string)
+            with self.assertRaises(Exception) as context:
+                parse_parallel(json_string, workers=2)
+            self.assertEqual(str(context.exception), str(expected.exception))
+
+    def test_parse_file_parallel(self):
+        with tempfile.NamedTemporaryFile('wb', suffix='.json', delete=False) as f:
+            f.write(b'[' + b', '.join(b'{"n": %d}' % i for i in range(100)) + b']')
+        self.addCleanup(os.remove, f.name)
+        self.assertEqual(parse_file_parallel(f.name, workers=2), [{"n": i} for i in range(100)])
+
+
+class StructuralIndexTestCase(TestCase):
+
+    def test_offsets_and_kinds(self):
+        index = StructuralIndex('{"a,b": [1, "x\\"]"], "c": {}}')
+        self.assertEqual(bytes(index.kinds), b'{":[,"],":{}}')
+        self.assertEqual(list(index.offsets), [0, 1, 6, 8, 10, 12, 18, 19, 21, 24, 26, 27, 28])
+        self.assertTrue(index.complete)
+        self.assertFalse(StructuralIndex('["abc, 1]').complete)
+
+    def test_bytes_input_gives_byte_offsets(self):
+        index = StructuralIndex('["\u00e9", 1]'.encode())
+        self.assertEqual(list(index.offsets), [0, 1, 5, 8])
+
+    def test_pairs_skip_and_commas(self):
+        index = StructuralIndex('[[1, 2], {"a": [3]}, 4]')
+        self.assertEqual(index.pair(0), len(index) - 1)
+        self.assertEqual(index.skip(1), 4) # past '[1, 2]' to the comma after it
+        self.assertEqual([index.offsets[comma] for comma in index.commas(0)], [7, 19])
+
+    def test_split(self):
+        index = StructuralIndex('[1, 2, 3, 4]')
+        self.assertEqual(index.split(2), [(1, 8), (9, 11)])
+        self.assertIsNone(StructuralIndex('{"a": 1}').split(2))
+        self.assertIsNone(StructuralIndex('[1, 2}').split(2))
+
+    @skipUnless(structural.numpy, "NumPy is not installed")
+    def test_numpy_matches_regex(self):
+        for json_string in ('{"a,b": [1, "x\\"]"], "c": {}}', '["a\\\\", "b"]', '["a\\\nb", "c"]', '["abc, 1]', '[]'):
+            by_regex = StructuralIndex(json_string, use_numpy=False)
+            by_numpy = StructuralIndex(json_string.encode(), use_numpy=True)
+            self.assertEqual(list(by_numpy.offsets), list(by_regex.offsets))
+            self.assertEqual(by_numpy.kinds, by_regex.kinds)
+            self.assertEqual(by_numpy.complete, by_regex.complete)
+
+    @skipUnless(structural.numpy, "NumPy is not installed")
+    def test_builders_agree_on_malformed_input(self):
+        for json_string in ('[{"k2: "\\""}]', '[\\"a", 1]', '\\\\"]', '["a\\', '["a\\\\"]', '"\\"\\\\"x', '[1, "a"\\"b", ]', '}"{', '\\'):
+            for block_size in (1, 2, 3, structural.BLOCK_SIZE):
+                with self.subTest(json_string=json_string, block_size=block_size), mock.patch.object(structural, 'BLOCK_SIZE', block_size):
+                    by_regex = StructuralIndex(json_string, use_numpy=False)
+                    by_numpy = StructuralIndex(json_string.encode(), use_numpy=True)
+                    self.assertEqual(list(by_numpy.offsets), list(by_regex.offsets))
+                    self.assertEqual(by_numpy.kinds, by_regex.kinds)
+                    self.assertEqual(by_numpy.complete, by_regex.complete)
+        self.assertTrue(StructuralIndex('[{"k2: "\\""}]', use_numpy=True).complete)
+
+    @skipUnless(structural.numpy, "NumPy is not installed")
+    def test_numpy_builder_works_in_blocks(self):
+        json_string = '[' + ', '.join(f'{{"k\\\\{i}": "v\\"{i}"}}' for i in range(200)) + ']'
+        expected = StructuralIndex(json_string, use_numpy=False)
+        with mock.patch.object(structural, 'BLOCK_SIZE', 7):
+            index = StructuralIndex(json_string.encode(), use_numpy=True)
+        self.assertEqual(list(index.offsets), list(expected.offsets))
+        self.assertEqual(index.kinds, expected.kinds)
+        self.assertEqual(index.offsets.itemsize, 4)
+
+
+class LazyParserTestCase(TestCase):
+
+    def test_lazy_views_equal_parse(self):
+        json_string = '{"user": {"name": "J\\u00f6hn", "tags": ["a", {"b": [1, 2.5]}]}, "ok": true, "none": null}'
+        result = parse_lazy(json_string)
+        self.assertIsInstance(result, Mapping)
+        self.assertIsInstance(result["user"]["tags"], Sequence)
+        self.assertEqual(result, parse(json_string))
+        self.assertEqual(list(result), ["user", "ok", "none"])
+        self.assertEqual(result["user"]["tags"][-1]["b"][1], 2.5)
+        self.assertEqual(result["user"]["tags"][:1], ["a"])
+
+    def test_children_are_built_once_on_access(self):
+        result = parse_lazy('[{"a": 1}, {"b": [2]}]')
+        self.assertIsInstance(result, LazyArray)
+        self.assertIsNone(result.spans)
+        first = result[0]
+        self.assertIsInstance(first, LazyObject)
+        self.assertIs(result[0], first)
+        self.assertIsNone(first.spans)
+        self.assertEqual(first["a"], 1)
+        self.assertIsNone(result[1].spans)
+        self.assertIsInstance(result[1]["b"], LazyArray)
+
+    def test_missing_keys_and_indexes(self):
+        result = parse_lazy('{"a": [1]}')
+        self.assertNotIn("b", result)
+        self.assertIsNone(result.get("b"))
+        with self.assertRaises(KeyError):
+            result["b"]
+        with self.assertRaises(IndexError):
+            result["a"][1]
+
+    def test_structure_is_checked_up_front(self):
+        for json_string in ('{"a": [1, 2}', '{"a": "b', '[1] 2', '[[[1]]]'):
+            with self.assertRaises(Exception):
+                parse_lazy(json_string, max_depth=3)
+
+    def test_other_errors_surface_on_access(self):
+        result = parse_lazy('{"good": [1], "bad": {"x" 1}}')
+        self.assertEqual(result["good"], [1])
+        with self.assertRaises(Exception) as context:
+            result["bad"]["x"]
+        self.assertEqual(str(context.exception), "Invalid JSON: Expected colon at line 1 and position 26, token type: number.")
+
+
+@skipUnless(columnar.numpy, "NumPy is not installed")
+class ColumnarParserTestCase(TestCase):
+
+    def test_number_arrays_become_ndarrays(self):
+        result = parse_columnar('{"ints": [1, -2,\n 3], "floats": [1.5, 2e3], "nested": [[1], [2.5]]}')
+        self.assertEqual(result["ints"].dtype, columnar.numpy.int64)
+        self.assertEqual(result["ints"].tolist(), [1, -2, 3])
+        self.assertEqual(result["floats"].dtype, columnar.numpy.float64)
+        self.assertEqual(result["floats"].tolist(), [1.5, 2000.0])
+        self.assertEqual([column.tolist() for column in result["nested"]], [[1], [2.5]])
+
+    def test_records_become_columns(self):
+        result = parse_columnar('[{"id": 1, "name": "a", "ok": true, "score": null}, {"id": 2, "name": "b", "ok": false, "score": 2.5}]')
+        self.assertEqual(list(result), ["id", "name", "ok", "score"])
+        self.assertEqual(result["id"].tolist(), [1, 2])
+        self.assertEqual(result["name"].tolist(), ["a", "b"])
+        self.assertEqual(result["ok"].dtype, bool)
+        self.assertTrue(columnar.numpy.isnan(result["score"][0]))
+        self.assertEqual(result["score"][1], 2.5)
+
+    def test_nullable_integer_columns_keep_exact_values(self):
+        result = parse_columnar('[{"a": 9007199254740992}, {"a": null}]')
+        self.assertEqual(result["a"][0], 2 ** 53)
+        self.assertTrue(columnar.numpy.isnan(result["a"][1]))
+        for json_string in ('[{"a": 9007199254740993}, {"a": null}]', '[{"a": -9007199254740993}, {"a": null}, {"a": 1}]'):
+            self.assertEqual(parse_columnar(json_string), parse(json_string))
+
+    def test_other_arrays_are_left_as_lists(self):
+        for json_string in ('[{"a": 1}, {"b": 1}]', '[{"a": 1}, {"a": "x"}]', '[{"a": {"b": 1}}]', '[12345678901234567890]', '["x", 1]', '[]'):
+            self.assertEqual(parse_columnar(json_string), parse(json_string))
+
+    def test_bytes_input(self):
+        self.assertEqual(parse_columnar(b'{"ints": [1, 2]}')["ints"].tolist(), [1, 2])
+
+    def test_max_depth_is_bounded_by_the_recursion_limit(self):
+        deep = '[' * 299 + '"x"' + ']' * 299
+        self.assertEqual(parse_columnar(deep, max_depth=300), parse(deep, max_depth=300))
+        with self.assertRaises(Exception) as context:
+            parse_columnar('[1]', max_depth=5000)
+        self.assertTrue(str(context.exception).startswith("max_depth can be at most 300 here"))
+
+    def test_errors_match_parse_fast(self):
+        for json_string in ('[1, 2,]', '[1 2]', '[{"a": 1},]', '[{"a": 1} {"a": 2}]', '[01]'):
+            with self.assertRaises(Exception) as expected:
+                parse_fast(json_string)
+            with self.assertRaises(Exception) as context:
+                parse_columnar(json_string)
+            self.assertEqual(str(context.exception), str(expected.exception))
+
+
+class BenchmarkTestCase(TestCase):
+
+    def test_corpora_parse_like_json_loads(self):
+        for name, build in benchmarks.CORPORA.items():
+            for document in build(5000):
+                self.assertEqual(parse(document), json.loads(document), name)
+
+    def test_command_writes_json_results(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'results.json')
+            call_command('bench_parser', corpus=['records', 'json_org'], parser=['parse', 'json.loads'], size=2000, repeat=1,
+                         no_rss=True, output=output, compare=None, stdout=io.StringIO())
+            with open(output) as file:
+                report = json.load(file)
+        self.assertEqual([(case['corpus'], case['parser']) for case in report['results']],
+                         [('records', 'parse'), ('records', 'json.loads'), ('json_org', 'parse'), ('json_org', 'json.loads')])
+        for case in report['results']:
+            self.assertGreater(case['mb_per_s'], 0)
+            self.assertGreater(case['peak_allocated_bytes'], 0)
+            self.assertIsNone(case['peak_rss_bytes'])
+        self.assertEqual(report['results'][2]['documents'], 3)
+
+
+class ParseViewTestCase(TestCase):
+
+    def tearDown(self):
+        shutdown_worker_pool()
+
+    async def test_parse_document(self):
+        response = await self.async_client.post('/parse/', '{"a": [1, 2.5, "x", null]}', content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"a": [1, 2.5, "x", None]})
+
+    @override_settings(JSON_PARSER_SERVICE={'CHUNK_SIZE': 3})
+    async def test_parse_document_in_chunks_with_paths(self):
+        response = await self.async_client.post('/parse/?path=user.name&path=$.tags[1]&path=missing',
+                                                '{"user": {"name": "café"}, "tags": ["a", "b"]}'.encode(), content_type='application/json')
+        self.assertEqual(response.json(), {"user.name": "café", "$.tags[1]": "b"})
+
+    @override_settings(JSON_PARSER_SERVICE={'OFFLOAD_SIZE': 0})
+    async def test_large_documents_go_to_the_worker_pool(self):
+        response = await self.async_client.post('/parse/?path=/b', '{"a": 1, "b": [true]}', content_type='application/json')
+        self.assertEqual(b''.join([chunk async for chunk in response.streaming_content]), b'{"/b":[true]}')
+        response = await self.async_client.post('/parse/', '[1, 2,]', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"error": "Invalid JSON: Unexpected trailing comma at line 1 and index 5, token type: rbracket."})
+
+    @override_settings(JSON_PARSER_SERVICE={'OFFLOAD_SIZE': 16, 'CHUNK_SIZE': 4})
+    async def test_size_is_counted_when_there_is_no_content_length(self):
+        with mock.patch.object(views, 'content_length', return_value=0):
+            response = await self.async_client.post('/parse/', '{"a": [1, 2, 3, 4, 5, 6]}', content_type='application/json')
+            self.assertTrue(response.streaming)
+            self.assertEqual(b''.join([chunk async for chunk in response.streaming_content]), b'{"a":[1,2,3,4,5,6]}')
+            response = await self.async_client.post('/parse/', '[1]', content_type='application/json')
+            self.assertFalse(response.streaming)
+
+    async def test_errors(self):
+        response = await self.async_client.post('/parse/', '[1, 2,]', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"error": "Invalid JSON: Unexpected trailing comma at line 1 and index 5, token type: rbracket."})
+        response = await self.async_client.get('/parse/')
+        self.assertEqual(response.status_code, 405)
+
+    async def test_parse_ndjson_streams_until_the_first_error(self):
+        body = '{"id": 1}\n\n{"id": 2, "x": [1]}\n[3,]\n{"id": 4}\n'
+        response = await self.async_client.post('/parse/ndjson/?path=id', body, content_type='application/x-ndjson')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = b''.join([chunk async for chunk in response.streaming_content]).decode().splitlines()
+        self.assertEqual([json.loads(line) for line in lines],
+                         [{"id": 1}, {"id": 2}, {"error": "Line 4: Invalid JSON: Unexpected trailing comma at line 1 and index 3, token type: rbracket."}])
+
+    @override_settings(JSON_PARSER_SERVICE={'OFFLOAD_SIZE': 0})
+    async def test_busy_pool_gets_a_503_before_the_ndjson_stream_starts(self):
+        with mock.patch.object(WorkerPool, 'run', side_effect=Busy("All 1 worker slots are in use, try again later.")):
+            response = await self.async_client.post('/parse/ndjson/', '[1]\n', content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '1')
+
+    @override_settings(JSON_PARSER_SERVICE={'OFFLOAD_SIZE': 20})
+    async def test_small_ndjson_batches_add_up_to_the_offload_size(self):
+        pool = mock.Mock(run=mock.AsyncMock(return_value=([[0]], None)))
+        with mock.patch.object(views, 'LINES_PER_BATCH', 1), mock.patch.object(views, 'get_worker_pool', return_value=pool):
+            response = await self.async_client.post('/parse/ndjson/', '[1, 1]\n' * 5, content_type='application/x-ndjson')
+            lines = b''.join([chunk async for chunk in response.streaming_content]).decode().splitlines()
+        self.assertEqual(lines, ['[1,1]'] * 2 + ['[0]'] * 3)
+        self.assertEqual([call.kwargs for call in pool.run.call_args_list], [{'wait': True}] * 3)
+
+    async def test_worker_pool_rejects_work_past_its_limit(self):
+        pool = WorkerPool(workers=1, max_pending=1)
+        try:
+            self.assertEqual(await pool.run(parse_lines, [1], [b'[1]'], [], 20), ([[1]], None))
+            first = asyncio.ensure_future(pool.run(time.sleep, 0.5))
+            await asyncio.sleep(0)
+            with self.assertRaises(Busy):
+                await pool.run(time.sleep, 0)
+            self.assertIsNone(await pool.run(time.sleep, 0, wait=True))
+            self.assertTrue(first.done())
+            self.assertIsNone(await pool.run(time.sleep, 0))
+        finally:
+            pool.shutdown()
+
+    def test_shutdown_worker_pool(self):
+        pool = get_worker_pool()
+        self.assertIs(get_worker_pool(), pool)
+        pool.get_executor()
+        shutdown_worker_pool()
+        self.assertIsNone(pool.executor)
+        self.assertIsNot(get_worker_pool(), pool)
+
+
+class ValidateTestCase(TestCase):
+
+    def test_json_org_test_cases(self):
+        test_dir = Path("json_parser/tests/json.org_tests/test").resolve()
+        for filename in os.listdir(test_dir):
+            with open(test_dir / filename, 'rb') as file:
+                data = file.read()
+            if filename.startswith('pass'):
+                self.assertIsNone(validate(data), filename)
+                self.assertIsNone(validate(data.decode()), filename)
+                continue
+            with self.assertRaises(Exception) as expected:
+                parse_fast(data.decode())
+            self.assertEqual(validate(data.decode()).message, str(expected.exception), filename)
+            self.assertEqual(validate(data).message, str(expected.exception), filename)
+
+    def test_error_location(self):
+        error = validate('{"é": [1,\n  2.],\n "b": 3}')
+        self.assertEqual((error.line, error.column, error.offset), (2, 3, 13))
+        self.assertEqual(error.message, "Invalid JSON: Unexpected character after '.' at line 2.")
+        self.assertEqual(validate('["ab\\x"]')[1:], (1, 5, 4)) # at the backslash
+        self.assertEqual(validate('[1, 2]]')[1:], (1, 7, 6))
+        self.assertEqual(validate('[1, 2')[1:], (1, 6, 5))
+        self.assertEqual(validate('').message, "Invalid JSON: Input is empty or contains only whitespace.")
+
+    def test_deep_documents_are_walked_without_recursion(self):
+        depth = 3000
+        self.assertIsNone(validate('[' * depth + '{"a": 1}' + ']' * depth, max_depth=depth + 2))
+        error = validate('[' * depth + '1,' + ']' * depth, max_depth=depth + 2)
+        self.assertEqual(error.message, f"Invalid JSON: Unexpected trailing comma at line 1 and position {depth + 2}, token type: rbracket.")
+        self.assertEqual(error.offset, depth + 2)
+        self.assertTrue(validate('[' * depth + ']' * depth, max_depth=depth).message.startswith("Maximum depth exceeded. Maximum depth is 3000."))
+
+    def test_bytes_input(self):
+        self.assertIsNone(validate(b'\xef\xbb\xbf["\xc3\xa9"]'))
+        self.assertEqual(validate(b'\xef\xbb\xbf[1,]')[1:], (1, 4, 6))
+        self.assertEqual(validate(b'[\n"\xc3\xa9\xff"]'), JSONError("Invalid JSON: Invalid UTF-8 at line 2.", 2, 3, 5))
+        self.assertEqual(validate(b'[1 "\xff"]').message, "Invalid JSON: Expected ',' or ']', but found something else. at line 1 and position 3, token type: string.")
+
+    def test_depth_limit(self):
+        self.assertIsNone(validate('[' * 19 + ']' * 19))
+        self.assertTrue(validate('[' * 20 + ']' * 20).message.startswith("Maximum depth exceeded."))
+        self.assertIsNone(validate('[' * 20 + ']' * 20, max_depth=21))
+
+    def test_agrees_with_parse(self):
+        for json_string in ('{"a": 1, "a": 2}', '[-0, 0.5e-3, 1E+2]', '{"k": "\\ud83d\\ude00"}', '[1 2]', '{1: 2}', '["a" "b"]',
+                            '[truefalse]', '[-]', '[01]', '{"a"}', '[1]\x00', '[\x01]', ' [1]', '[1] [2]', '["\t"]', '[ ]'):
+            try:
+                parse_fast(json_string)
+                self.assertIsNone(validate(json_string), json_string)
+            except Exception as e:
+                self.assertEqual(validate(json_string).message, str(e), json_string)
+
+
+class SchemaTestCase(TestCase):
+    SCHEMA = {
+        "type": "object",
+        "required": ["users"],
+        "properties": {
+            "users": {
+                "type": "array",
+                "maxItems": 2,
+                "items": {
+                    "type": "object",
+                    "required": ["id"],
+                    "properties": {
+                        "id": {"type": "integer", "minimum": 1},
+                        "name": {"type": "string", "maxLength": 5},
+                        "role": {"enum": ["admin", "user"]},
+                        "tags": {"type": "array", "minItems": 1, "items": {"type": "string"}},
+                    },
+                },
+            },
+        },
+    }
+
+    def test_valid_documents_parse_as_usual(self):
+        json_string = '{"users": [{"id": 1, "name": "ann", "role": "user", "tags": ["a"]}, {"id": 2.0, "extra": {"x": [null]}}]}'
+        self.assertEqual(parse(json_string, schema=self.SCHEMA), parse(json_string))
+
+    def test_first_violation_with_path_and_line(self):
+        cases = [
+            ('{"users": [{"id": 1},\n {"id": 0}]}', 'Schema violation: $.users[1].id should be at least 1 at line 2.'),
+            ('{"users": [{"id": 1, "name": "annabel"}]}', 'Schema violation: $.users[0].name should be at most 5 characters long at line 1.'),
+            ('{"users": [{"name": "ann"}]}', 'Schema violation: $.users[0] is missing required property "id" at line 1.'),
+            ('{"users": [{"id": 1, "role": "root"}]}', 'Schema violation: $.users[0].role should be one of ["admin", "user"] at line 1.'),
+            ('{"users": [{"id": true}]}', 'Schema violation: $.users[0].id should be integer, not boolean at line 1.'),
+            ('{"users": [{"id": 1, "tags": []}]}', 'Schema violation: $.users[0].tags should have at least 1 items at line 1.'),
+            ('{"users": [{"id": 1}, {"id": 2}, {"id": 3}]}', 'Schema violation: $.users should have at most 2 items at line 1.'),
+            ('{"users": {}}', 'Schema violation: $.users should be array, not object at line 1.'),
+            ('[]', 'Schema violation: $ should be object, not array at line 1.'),
+            ('{}', 'Schema violation: $ is missing required property "users" at line 1.'),
+        ]
+        for json_string, message in cases:
+            with self.assertRaises(Exception) as context:
+                parse(json_string, schema=self.SCHEMA)
+            self.assertEqual(str(context.exception), message)
+
+    def test_fails_before_reaching_later_syntax_errors(self):
+        with self.assertRaises(Exception) as context:
+            parse('{"users": "none", "x": [1,]}', schema=self.SCHEMA)
+        self.assertEqual(str(context.exception), 'Schema violation: $.users should be array, not string at line 1.')
+
+    def test_enum_and_numbers_keep_json_types(self):
+        self.assertEqual(parse('[1, 1.0, 5]', schema={"items": {"enum": [1, 5]}}), [1, 1.0, 5])
+        with self.assertRaises(Exception):
+            parse('[true]', schema={"items": {"enum": [1]}})
+        self.assertEqual(parse('[2.5]', schema={"items": {"type": "number", "exclusiveMaximum": 3}}, parse_float=Decimal), [Decimal('2.5')])
+
+    def test_compiled_schemas_are_cached(self):
+        self.assertIs(compile_schema({"type": "string", "maxLength": 3}), compile_schema({"maxLength": 3, "type": "string"}))
+        self.assertIsNone(compile_schema({"title": "anything"}))
+        parser = SchemaParser({"type": "array"})
+        self.assertEqual([parser.parse('[1]'), parser.parse(b'[2]')], [[1], [2]])
+
+    def test_invalid_schemas(self):
+        for schema, message in (({"type": "list"}, "Invalid schema: type at $ must be one of string, integer, number, boolean, null, object, array, or a list of them."),
+                                ({"properties": {"a": {"pattern": "x"}}}, "Invalid schema: Unsupported keyword pattern at $.properties.a."),
+                                ({"maxLength": -1}, "Invalid schema: maxLength at $ must be a non-negative integer.")):
+            with self.assertRaises(Exception) as context:
+                parse('[1]', schema=schema)
+            self.assertEqual(str(context.exception), message)
+
+
+class SerializerTestCase(TestCase):
+
+    def test_json_org_round_trip(self):
+        test_dir = Path("json_parser/tests/json.org_tests/test").resolve()
+        for filename in os.listdir(test_dir):
+            if not filename.startswith('pass'):
+                continue
+            with open(test_dir / filename) as file:
+                value = parse(file.read())
+            self.assertEqual(parse(dumps(value)), value, filename)
+            self.assertEqual(parse(dumps(value, sort_keys=True, indent=2)), value, filename)
+            self.assertEqual(dumps(value), json.dumps(value, separators=(',', ':'), ensure_ascii=False), filename)
+
+    def test_formatting(self):
+        value = {"b": [1, 2.5, None, True], "a": {}, "c": [{}]}
+        self.assertEqual(dumps(value), '{"b":[1,2.5,null,true],"a":{},"c":[{}]}')
+        self.assertEqual(dumps(value, sort_keys=True, indent=2), json.dumps(value, sort_keys=True, indent=2))
+        self.assertEqual(dumps((1, MappingProxyType({"x": Decimal("1.50")}))), '[1,{"x":1.50}]')
+
+    def test_string_escapes(self):
+        self.assertEqual(dumps(['"\\/\b\f\n\r\t\x00\x1f', 'é😀']), '["\\"\\\\/\\b\\f\\n\\r\\t\\u0000\\u001f","é😀"]')
+        surrogates = parse('["\\ud83d\\ude00"]') # kept as two code points
+        self.assertEqual(dumps(surrogates), '["\\ud83d\\ude00"]')
+        self.assertEqual(parse(dumps(surrogates)), surrogates)
+
+    def test_no_depth_limit(self):
+        value = []
+        for _ in range(10000):
+            value = [value]
+        self.assertEqual(dumps(value), '[' * 10001 + ']' * 10001)
+
+    def test_chunked_output(self):
+        value = [{"id": i, "name": f"user{i}"} for i in range(5000)]
+        chunks = list(iterdumps(value, chunk_size=1000))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(''.join(chunks), dumps(value))
+        output = io.StringIO()
+        dump(value, output, indent=1)
+        self.assertEqual(output.getvalue(), dumps(value, indent=1))
+
+    def test_errors(self):
+        circular = []
+        circular.append(circular)
+        for value, message in ((circular, "Cannot serialize a circular reference."),
+                               ({1: 2}, "Cannot serialize a key of type int; keys must be strings."),
+                               ([float('inf')], "Cannot serialize inf: out of range numbers are not valid JSON."),
+                               ({1, 2}, "Cannot serialize an object of type set.")):
+            with self.assertRaises(Exception) as context:
+                dumps(value)
+            self.assertEqual(str(context.exception), message)
+        self.assertEqual(dumps([{2, 1}], default=sorted), '[[1,2]]')
+
+
+class ProfilingTestCase(TestCase):
+    DOCUMENT = '{"a": [1, 2.5, "x\\n\\u00e9y", "caf\u00e9"], "b": {"c": null, "d": true}, "e": [[[]]]}'
+
+    def test_counts(self):
+        for document in (self.DOCUMENT, self.DOCUMENT.encode()):
+            value, stats = profile(document)
+            self.assertEqual(value, parse(document))
+            self.assertEqual(stats.documents, 1)
+            self.assertEqual(stats.tokens[TokenType.STRING], 7)
+            self.assertEqual(stats.tokens[TokenType.LBRACKET], 4)
+            self.assertEqual(stats.tokens[TokenType.EOF], 1)
+            self.assertEqual(stats.string_bytes, 20) # five keys, x\n\u00e9y and caf\u00e9 in UTF-8
+            self.assertEqual(stats.escapes, 2)
+            self.assertEqual(stats.numbers, {'integer': 1, 'float': 1})
+            self.assertEqual(stats.max_depth, 4)
+            self.assertEqual(stats.peak_container_size, 4)
+
+    def test_timings(self):
+        _, stats = profile('[' + ', '.join(f'"s{i}", {i}' for i in range(1000)) + ']')
+        timings = stats.timings
+        self.assertTrue(all(seconds > 0 for seconds in timings.values()))
+        self.assertLess(timings['tokenize'] + timings['strings'] + timings['numbers'] + timings['build'], timings['total'])
+
+    def test_accumulates_and_calls_back(self):
+        snapshots = []
+        stats = ParseStats(callback=lambda stats: snapshots.append(stats.as_dict()))
+        parse_many(['[1]', '[[2, 3, 4]]'], stats=stats)
+        with self.assertRaises(Exception):
+            parse('[1,', stats=stats)
+        self.assertEqual([(snapshot['documents'], snapshot['errors']) for snapshot in snapshots], [(1, 0), (2, 0), (2, 1)])
+        self.assertEqual(snapshots[-1]['numbers'], {'integer': 5, 'float': 0})
+        self.assertEqual(snapshots[-1]['tokens']['number'], 5)
+        self.assertEqual(stats.max_depth, 2)
+        self.assertEqual(stats.peak_container_size, 3)
+        json.dumps(snapshots[-1])
+
+    def test_profiling_parser_only_swaps_the_scanner(self):
+        parser = ProfilingParser(ParseStats())
+        self.assertIsInstance(parser.make_scanner('[1]'), ProfilingScanner)
+        self.assertIsInstance(parser.make_scanner(b'[1]'), ProfilingByteScanner)
+        with self.assertRaises(Exception):
+            parser.parse('   ')
+        self.assertEqual((parser.stats.documents, parser.stats.errors), (0, 1))
+        self.assertIsNone(parser.scanner)
+
+    def test_schema_and_stats(self):
+        with self.assertRaises(Exception) as context:
+            parse('[1]', schema={'type': 'array'}, stats=ParseStats())
+        self.assertEqual(str(context.exception), "Cannot collect stats while checking a schema.")
@@ -0,0 +1,7 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('', views.parse_document, name='parse_document'),
+    path('ndjson/', views.parse_ndjson, name='parse_ndjson'),
+]
@@ -1,3 +1,119 @@
-from django.shortcuts import render
+import asyncio
+from django.http import HttpResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from json_parser.services.batch import CHUNK_SIZE as LINES_PER_BATCH, numbered_chunks
+from json_parser.services.extract import path_trie, lookup
+from json_parser.services.incremental import IncrementalParser
+from json_parser.services.serializer import dumps, iterdumps
+from json_parser.services.workers import Busy, get_worker_pool, parse_body, parse_lines, service_settings
 
-# Create your views here.
+# Django's ASGI handler spools the request body (in memory, or on disk once it is larger than
+# FILE_UPLOAD_MAX_MEMORY_SIZE) before a view runs. These views read it back in chunks, so a
+# large body is never held as one string, and yield to the event loop between chunks.
+
+
+@csrf_exempt
+@require_POST
+async def parse_document(request):
+    # POST a JSON document. Responds with the parsed document, or with {path: value} for every
+    # ?path= given that exists in it; errors are {"error": message} with status 400.
+    options = service_settings()
+    paths = request.GET.getlist('path')
+    try:
+        large, result = await parse_body_of(request, paths, options)
+    except Busy as e:
+        return json_response({'error': str(e)}, status=503, headers={'Retry-After': '1'})
+    except Exception as e:
+        return json_response({'error': str(e)}, status=400)
+    if large:
+        return StreamingHttpResponse(serialized_chunks(result), content_type='application/json')
+    return json_response(result)
+
+
+@csrf_exempt
+@require_POST
+async def parse_ndjson(request):
+    # POST newline-delimited JSON. Streams back one line per non-blank input line as batches
+    # are parsed: the value, or {path: value} with ?path=. The stream ends with an
+    # {"error": message} line at the first invalid line.
+    paths = request.GET.getlist('path')
+    results = ndjson_results(request, paths, service_settings())
+    # the first batch is parsed before the response starts, so a busy pool can still get a 503
+    try:
+        first = await anext(results, '')
+    except Busy as e:
+        return json_response({'error': str(e)}, status=503, headers={'Retry-After': '1'})
+    return StreamingHttpResponse(prepend(first, results), content_type='application/x-ndjson')
+
+
+async def parse_body_of(request, paths, options):
+    # Returns (offloaded, result). The body goes to the worker pool once OFFLOAD_SIZE bytes of
+    # it have been read, so a body without a Content-Length, such as a chunked upload, can't
+    # keep the event loop busy either; a Content-Length that large sends it there right away.
+    offload_size = options['offload_size']
+    if content_length(request) >= offload_size:
+        return True, await get_worker_pool().run(parse_body, request.read(), paths, options['max_depth'])
+
+    parser = IncrementalParser(options['max_depth'])
+    chunks, size = [], 0
+    while chunk := request.read(options['chunk_size']):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= offload_size:
+            chunks.append(request.read())
+            return True, await get_worker_pool().run(parse_body, b''.join(chunks), paths, options['max_depth'])
+        parser.feed(chunk)
+        await asyncio.sleep(0)
+    result = parser.close()
+    if not paths:
+        return False, result
+    found = {}
+    lookup(result, path_trie(paths), found)
+    return False, found
+
+
+async def ndjson_results(request, paths, options):
+    # Batches go to the worker pool once the lines parsed on the event loop for this request
+    # add up to OFFLOAD_SIZE, whether that takes one large batch or many small ones. Once the
+    # first chunk has been sent the status can't change, so from then on a busy pool is
+    # waited for rather than reported.
+    lines = ((number, line) for number, line in enumerate(request, 1) if line.strip())
+    inline_size = 0
+    started = False
+    for numbers, batch in numbered_chunks(lines, LINES_PER_BATCH):
+        size = sum(map(len, batch))
+        if inline_size + size >= options['offload_size']:
+            results, error = await get_worker_pool().run(parse_lines, numbers, batch, paths, options['max_depth'], wait=started)
+        else:
+            inline_size += size
+            results, error = parse_lines(numbers, batch, paths, options['max_depth'])
+        yield ''.join(dumps(result) + '\n' for result in results)
+        started = True
+        if error is not None:
+            yield dumps({'error': error}) + '\n'
+            return
+        await asyncio.sleep(0)
+
+
+async def prepend(first, rest):
+    yield first
+    async for chunk in rest:
+        yield chunk
+
+
+async def serialized_chunks(value):
+    for chunk in iterdumps(value):
+        yield chunk
+        await asyncio.sleep(0)
+
+
+def json_response(data, status: int = 200, headers=None) -> HttpResponse:
+    return HttpResponse(dumps(data), content_type='application/json', status=status, headers=headers)
+
+
+def content_length(request) -> int:
+    try:
+        return int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        return 0
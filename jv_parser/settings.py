@@ -37,6 +37,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'json_parser',
 ]
 
 MIDDLEWARE = [
@@ -121,3 +122,25 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Opt-in cache for json_parser.services.parse_cached. Set BACKEND to a CACHES alias to
+# share parsed documents between processes instead of keeping them in process memory.
+
+JSON_PARSER_CACHE = {
+    'MAX_ENTRIES': 256,
+    'MAX_BYTES': 16 * 1024 * 1024,
+    'BACKEND': None,
+    'TIMEOUT': 300,
+}
+
+# Streaming parse endpoints in json_parser.views. Bodies of at least OFFLOAD_SIZE bytes (and
+# NDJSON batches that large) are parsed on a pool of WORKERS processes (None: one per CPU);
+# once MAX_PENDING documents are waiting on it (None: two per worker) requests get a 503.
+
+JSON_PARSER_SERVICE = {
+    'WORKERS': None,
+    'MAX_PENDING': None,
+    'OFFLOAD_SIZE': 256 * 1024,
+    'CHUNK_SIZE': 64 * 1024,
+    'MAX_DEPTH': 20,
+}